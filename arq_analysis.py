@@ -5,22 +5,79 @@ This module provides advanced analysis tools and visualizations
 for comparing ARQ protocol performance under different conditions.
 """
 
+import os
+import sys
+import copy
 import time
 import random
+import inspect
+import importlib.util
+import weakref
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
 import json
 
-# Optional imports for visualization
+# Optional imports for vectorized analysis and visualization. matplotlib is
+# only imported when a plot is actually requested.
 try:
-    import matplotlib.pyplot as plt
     import numpy as np
-    VISUALIZATION_AVAILABLE = True
+    NUMPY_AVAILABLE = True
 except ImportError:
-    VISUALIZATION_AVAILABLE = False
+    NUMPY_AVAILABLE = False
 
-@dataclass
+VISUALIZATION_AVAILABLE = NUMPY_AVAILABLE and importlib.util.find_spec('matplotlib') is not None
+
+# Optional fast JSON serializer for exported results
+try:
+    import orjson
+
+    def _dump_json(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dump_json(data) -> bytes:
+        return json.dumps(data, indent=2).encode()
+
+# Theoretical error-rate model shared by the scalar and NumPy paths:
+# (results key, retransmissions per frame per unit error rate, seconds per transmission)
+ERROR_RATE_MODEL = (
+    ('stop_and_wait', 2, 0.1),       # Linear increase in retransmissions
+    ('go_back_n', 3.5, 0.05),        # Cascading go-back retransmissions; faster due to pipelining
+    ('selective_repeat', 1.2, 0.03), # Only lost frames retransmitted; fastest
+)
+
+# Row templates for the performance report tables
+ERROR_ROW_FMT = "{:>6.0f}%      {:<18} {:<15.1f} {:<12.1f} {:<10.2f}"
+WINDOW_ROW_FMT = "{:<12} {:<18} {:<12.2f} {:<12.1f}"
+_PROTO_DISPLAY = {'stop_and_wait': 'Stop-And-Wait', 'go_back_n': 'Go-Back-N',
+                  'selective_repeat': 'Selective-Repeat'}
+
+# Dedicated generator for protocol test runs, keeps the global random stream untouched
+_SIM_RNG = random.Random()
+
+# receiver class -> whether its constructor takes a window_size argument
+_accepts_ws_cache: "weakref.WeakKeyDictionary[type, bool]" = weakref.WeakKeyDictionary()
+
+def _accepts_window_size(receiver_class) -> bool:
+    """Check (once per class) whether a receiver is constructed with a window size"""
+    accepts = _accepts_ws_cache.get(receiver_class)
+    if accepts is None:
+        accepts = 'window_size' in inspect.signature(receiver_class).parameters
+        _accepts_ws_cache[receiver_class] = accepts
+    return accepts
+
+# (results key, legend label, matplotlib format) for each plotted protocol
+PLOT_STYLES = (
+    ('stop_and_wait', 'Stop-and-Wait', 'r-o'),
+    ('go_back_n', 'Go-Back-N', 'g-s'),
+    ('selective_repeat', 'Selective Repeat', 'b-^')
+)
+
+@dataclass(frozen=True)
 class SimulationResult:
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('protocol_name', 'window_size', 'error_rate', 'frames_sent',
+                 'frames_received', 'total_transmissions', 'retransmissions',
+                 'simulation_time', 'throughput', 'efficiency')
     protocol_name: str
     window_size: int
     error_rate: float
@@ -35,8 +92,13 @@ class SimulationResult:
 class ARQAnalyzer:
     """Advanced analyzer for ARQ protocol performance"""
     
+    _TEST_DATA_CACHE: Dict[int, Tuple[str, ...]] = {}  # frame_count -> payloads
+    
     def __init__(self):
         self.results = []
+        # Cached results are never handed out directly; callers get deep copies
+        self._err_cache = {}  # error_rates tuple -> analysis results
+        self._win_cache = {}  # window_sizes tuple -> analysis results
     
     def run_protocol_test(self, protocol_class, sender_class, receiver_class, 
                          test_params: Dict) -> SimulationResult:
@@ -49,23 +111,23 @@ class ARQAnalyzer:
         timeout = test_params.get('timeout', 1.0)
         
         # Set error rates (this would need to be implemented in each protocol)
-        original_seed = random.getstate()
-        random.seed(42)  # For reproducible results
+        _SIM_RNG.seed(42)  # For reproducible results
         
-        # Create test data
-        test_data = [f"Frame{i}" for i in range(1, frame_count + 1)]
+        # Create test data (read-only, so shared between runs)
+        test_data = self._TEST_DATA_CACHE.get(frame_count)
+        if test_data is None:
+            test_data = tuple(f"Frame{i}" for i in range(1, frame_count + 1))
+            self._TEST_DATA_CACHE[frame_count] = test_data
         
         # Initialize protocol components
         if window_size == 1:  # Stop-and-Wait
             sender = sender_class(timeout=timeout)
-            receiver = receiver_class()
+            receiver = receiver_class(rng=_SIM_RNG)
         else:  # Windowed protocols
             sender = sender_class(window_size=window_size, timeout=timeout)
-            receiver = receiver_class(window_size=window_size) if hasattr(receiver_class, '__init__') and 'window_size' in receiver_class.__init__.__code__.co_varnames else receiver_class()
+            receiver = receiver_class(window_size=window_size, rng=_SIM_RNG) if _accepts_window_size(receiver_class) else receiver_class(rng=_SIM_RNG)
         
         # Run simulation
-        start_time = time.time()
-        
         if hasattr(sender, 'add_data'):  # Windowed protocols
             sender.add_data(test_data)
             sender.send_frames(receiver)
@@ -73,19 +135,14 @@ class ARQAnalyzer:
             for data in test_data:
                 sender.send_frame(data, receiver)
         
-        end_time = time.time()
-        
-        # Collect statistics
+        # Collect statistics (simulated channel time, not wall-clock time)
         sender_stats = sender.get_statistics()
-        simulation_time = end_time - start_time
+        simulation_time = sender.virtual_clock
         
         # Calculate metrics
-        frames_received = len(receiver.get_received_data())
+        frames_received = receiver.received_count
         throughput = frames_received / simulation_time if simulation_time > 0 else 0
-        efficiency = float(sender_stats['efficiency'].rstrip('%')) if isinstance(sender_stats['efficiency'], str) else sender_stats['efficiency']
-        
-        # Restore random state
-        random.setstate(original_seed)
+        efficiency = sender_stats['efficiency']
         
         return SimulationResult(
             protocol_name=protocol_class.__name__,
@@ -105,15 +162,43 @@ class ARQAnalyzer:
         if error_rates is None:
             error_rates = [0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3]
         
+        # The model is deterministic, so repeated sweeps can reuse results
+        key = tuple(error_rates)
+        cached = self._err_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         results = {
-            'error_rates': error_rates,
+            'error_rates': list(error_rates),
             'stop_and_wait': {'transmissions': [], 'efficiency': [], 'throughput': []},
             'go_back_n': {'transmissions': [], 'efficiency': [], 'throughput': []},
             'selective_repeat': {'transmissions': [], 'efficiency': [], 'throughput': []}
         }
         
         print("📊 Analyzing error rate impact on ARQ protocols...")
-        
+
+        if NUMPY_AVAILABLE:
+            for error_rate in error_rates:
+                print(f"  Testing error rate: {error_rate*100:.0f}%")
+
+            # Same theoretical model as the scalar loop below, evaluated over
+            # the whole sweep at once
+            base_frames = 10
+            er = np.asarray(error_rates, dtype=float)
+
+            for protocol, retrans_factor, time_per_tx in ERROR_RATE_MODEL:
+                total = base_frames + base_frames * er * retrans_factor
+                efficiency = np.divide(base_frames, total,
+                                       out=np.zeros_like(total), where=total > 0) * 100
+                throughput = base_frames / (total * time_per_tx)
+
+                results[protocol]['transmissions'] = total.tolist()
+                results[protocol]['efficiency'] = efficiency.tolist()
+                results[protocol]['throughput'] = throughput.tolist()
+
+            self._err_cache[key] = results
+            return copy.deepcopy(results)
+
         for error_rate in error_rates:
             print(f"  Testing error rate: {error_rate*100:.0f}%")
             
@@ -123,51 +208,59 @@ class ARQAnalyzer:
             # Simulate results based on theoretical behavior
             base_frames = 10
             
-            # Stop-and-Wait: Linear increase in retransmissions
-            sw_retrans = base_frames * error_rate * 2
-            sw_total = base_frames + sw_retrans
-            sw_efficiency = base_frames / sw_total * 100 if sw_total > 0 else 0
-            sw_throughput = base_frames / (sw_total * 0.1)  # Assuming 0.1s per transmission
-            
-            # Go-Back-N: Exponential increase due to cascading effect
-            gbn_retrans = base_frames * error_rate * 3.5  # Higher multiplier
-            gbn_total = base_frames + gbn_retrans
-            gbn_efficiency = base_frames / gbn_total * 100 if gbn_total > 0 else 0
-            gbn_throughput = base_frames / (gbn_total * 0.05)  # Faster due to pipelining
-            
-            # Selective Repeat: Minimal increase, only lost frames
-            sr_retrans = base_frames * error_rate * 1.2
-            sr_total = base_frames + sr_retrans
-            sr_efficiency = base_frames / sr_total * 100 if sr_total > 0 else 0
-            sr_throughput = base_frames / (sr_total * 0.03)  # Fastest due to selective retransmission
-            
-            results['stop_and_wait']['transmissions'].append(sw_total)
-            results['stop_and_wait']['efficiency'].append(sw_efficiency)
-            results['stop_and_wait']['throughput'].append(sw_throughput)
-            
-            results['go_back_n']['transmissions'].append(gbn_total)
-            results['go_back_n']['efficiency'].append(gbn_efficiency)
-            results['go_back_n']['throughput'].append(gbn_throughput)
-            
-            results['selective_repeat']['transmissions'].append(sr_total)
-            results['selective_repeat']['efficiency'].append(sr_efficiency)
-            results['selective_repeat']['throughput'].append(sr_throughput)
+            for protocol, retrans_factor, time_per_tx in ERROR_RATE_MODEL:
+                total = base_frames + base_frames * error_rate * retrans_factor
+                efficiency = base_frames / total * 100 if total > 0 else 0
+                throughput = base_frames / (total * time_per_tx)
+                
+                columns = results[protocol]
+                columns['transmissions'].append(total)
+                columns['efficiency'].append(efficiency)
+                columns['throughput'].append(throughput)
         
-        return results
+        self._err_cache[key] = results
+        return copy.deepcopy(results)
     
     def analyze_window_size_impact(self, window_sizes: List[int] = None) -> Dict:
         """Analyze how window size affects windowed protocols"""
         if window_sizes is None:
             window_sizes = [1, 2, 4, 8, 16, 32]
         
+        key = tuple(window_sizes)
+        cached = self._win_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         results = {
-            'window_sizes': window_sizes,
+            'window_sizes': list(window_sizes),
             'go_back_n': {'throughput': [], 'efficiency': []},
             'selective_repeat': {'throughput': [], 'efficiency': []}
         }
         
         print("📊 Analyzing window size impact on windowed protocols...")
         
+        if NUMPY_AVAILABLE:
+            for window_size in window_sizes:
+                print(f"  Testing window size: {window_size}")
+            
+            # Same theoretical model as the scalar loop below, over all sizes at once
+            base_throughput = 10  # Base throughput
+            error_rate = 0.1
+            ws = np.asarray(window_sizes)
+            
+            gbn_throughput = base_throughput * np.minimum(ws, 8) * (1 - error_rate * 0.5)
+            gbn_efficiency = np.maximum(100 * (1 - error_rate * ws * 0.1), 20)
+            sr_throughput = base_throughput * np.minimum(ws, 16) * (1 - error_rate * 0.2)
+            sr_efficiency = np.full(ws.shape, max(100 * (1 - error_rate * 0.05), 50))
+            
+            results['go_back_n']['throughput'] = gbn_throughput.tolist()
+            results['go_back_n']['efficiency'] = gbn_efficiency.tolist()
+            results['selective_repeat']['throughput'] = sr_throughput.tolist()
+            results['selective_repeat']['efficiency'] = sr_efficiency.tolist()
+            
+            self._win_cache[key] = results
+            return copy.deepcopy(results)
+        
         for window_size in window_sizes:
             print(f"  Testing window size: {window_size}")
             
@@ -191,70 +284,74 @@ class ARQAnalyzer:
             results['selective_repeat']['throughput'].append(sr_throughput)
             results['selective_repeat']['efficiency'].append(sr_efficiency)
         
-        return results
+        self._win_cache[key] = results
+        return copy.deepcopy(results)
     
     def generate_performance_report(self) -> str:
         """Generate a comprehensive performance analysis report"""
         
         report = []
-        report.append("="*80)
-        report.append("ARQ PROTOCOLS - COMPREHENSIVE PERFORMANCE ANALYSIS")
-        report.append("="*80)
+        append = report.append
+        append("="*80)
+        append("ARQ PROTOCOLS - COMPREHENSIVE PERFORMANCE ANALYSIS")
+        append("="*80)
         
         # Error rate analysis
         error_analysis = self.analyze_error_rate_impact()
-        report.append("\n📊 ERROR RATE IMPACT ANALYSIS")
-        report.append("-"*50)
-        
-        report.append(f"{'Error Rate':<12} {'Protocol':<18} {'Transmissions':<15} {'Efficiency':<12} {'Throughput':<10}")
-        report.append("-"*80)
-        
-        for i, error_rate in enumerate(error_analysis['error_rates']):
-            for protocol in ['stop_and_wait', 'go_back_n', 'selective_repeat']:
-                transmissions = error_analysis[protocol]['transmissions'][i]
-                efficiency = error_analysis[protocol]['efficiency'][i]
-                throughput = error_analysis[protocol]['throughput'][i]
-                
-                protocol_name = protocol.replace('_', '-').title()
-                report.append(f"{error_rate*100:>6.0f}%      {protocol_name:<18} {transmissions:<15.1f} {efficiency:<12.1f} {throughput:<10.2f}")
+        append("\n📊 ERROR RATE IMPACT ANALYSIS")
+        append("-"*50)
+        
+        append(f"{'Error Rate':<12} {'Protocol':<18} {'Transmissions':<15} {'Efficiency':<12} {'Throughput':<10}")
+        append("-"*80)
+        
+        _row = ERROR_ROW_FMT.format
+        report.extend([
+            _row(error_rate*100, _PROTO_DISPLAY[protocol],
+                 error_analysis[protocol]['transmissions'][i],
+                 error_analysis[protocol]['efficiency'][i],
+                 error_analysis[protocol]['throughput'][i])
+            for i, error_rate in enumerate(error_analysis['error_rates'])
+            for protocol in ('stop_and_wait', 'go_back_n', 'selective_repeat')
+        ])
         
         # Window size analysis
         window_analysis = self.analyze_window_size_impact()
-        report.append(f"\n📊 WINDOW SIZE IMPACT ANALYSIS")
-        report.append("-"*50)
+        append(f"\n📊 WINDOW SIZE IMPACT ANALYSIS")
+        append("-"*50)
         
-        report.append(f"{'Window Size':<12} {'Protocol':<18} {'Throughput':<12} {'Efficiency':<12}")
-        report.append("-"*60)
+        append(f"{'Window Size':<12} {'Protocol':<18} {'Throughput':<12} {'Efficiency':<12}")
+        append("-"*60)
         
-        for i, window_size in enumerate(window_analysis['window_sizes']):
-            for protocol in ['go_back_n', 'selective_repeat']:
-                throughput = window_analysis[protocol]['throughput'][i]
-                efficiency = window_analysis[protocol]['efficiency'][i]
-                
-                protocol_name = protocol.replace('_', '-').title()
-                report.append(f"{window_size:<12} {protocol_name:<18} {throughput:<12.2f} {efficiency:<12.1f}")
+        _row = WINDOW_ROW_FMT.format
+        report.extend([
+            _row(window_size, _PROTO_DISPLAY[protocol],
+                 window_analysis[protocol]['throughput'][i],
+                 window_analysis[protocol]['efficiency'][i])
+            for i, window_size in enumerate(window_analysis['window_sizes'])
+            for protocol in ('go_back_n', 'selective_repeat')
+        ])
         
         # Recommendations
-        report.append(f"\n🎯 RECOMMENDATIONS")
-        report.append("-"*50)
-        report.append("• Low error rate (<5%): Use Selective Repeat for maximum efficiency")
-        report.append("• Medium error rate (5-15%): Use Go-Back-N for balanced performance")
-        report.append("• High error rate (>15%): Use Stop-and-Wait for reliability")
-        report.append("• High-speed networks: Selective Repeat with large windows")
-        report.append("• Resource-constrained systems: Stop-and-Wait or small window Go-Back-N")
-        report.append("• Real-time applications: Go-Back-N with moderate window size")
+        append(f"\n🎯 RECOMMENDATIONS")
+        append("-"*50)
+        append("• Low error rate (<5%): Use Selective Repeat for maximum efficiency")
+        append("• Medium error rate (5-15%): Use Go-Back-N for balanced performance")
+        append("• High error rate (>15%): Use Stop-and-Wait for reliability")
+        append("• High-speed networks: Selective Repeat with large windows")
+        append("• Resource-constrained systems: Stop-and-Wait or small window Go-Back-N")
+        append("• Real-time applications: Go-Back-N with moderate window size")
         
         # Protocol selection guide
-        report.append(f"\n📋 PROTOCOL SELECTION GUIDE")
-        report.append("-"*50)
-        report.append(f"{'Scenario':<25} {'Recommended Protocol':<20} {'Reason'}")
-        report.append("-"*70)
-        report.append(f"{'Satellite communication':<25} {'Stop-and-Wait':<20} {'High latency, errors'}")
-        report.append(f"{'LAN networks':<25} {'Selective Repeat':<20} {'Low latency, high speed'}")
-        report.append(f"{'Wireless networks':<25} {'Go-Back-N':<20} {'Moderate errors'}")
-        report.append(f"{'IoT devices':<25} {'Stop-and-Wait':<20} {'Simple, low power'}")
-        report.append(f"{'Video streaming':<25} {'Selective Repeat':<20} {'High throughput needed'}")
-        report.append(f"{'File transfer':<25} {'Go-Back-N':<20} {'Reliability + efficiency'}")
+        append(f"\n📋 PROTOCOL SELECTION GUIDE")
+        append("-"*50)
+        append(f"{'Scenario':<25} {'Recommended Protocol':<20} {'Reason'}")
+        append("-"*70)
+        append(f"{'Satellite communication':<25} {'Stop-and-Wait':<20} {'High latency, errors'}")
+        append(f"{'LAN networks':<25} {'Selective Repeat':<20} {'Low latency, high speed'}")
+        append(f"{'Wireless networks':<25} {'Go-Back-N':<20} {'Moderate errors'}")
+        append(f"{'IoT devices':<25} {'Stop-and-Wait':<20} {'Simple, low power'}")
+        append(f"{'Video streaming':<25} {'Selective Repeat':<20} {'High throughput needed'}")
+        append(f"{'File transfer':<25} {'Go-Back-N':<20} {'Reliability + efficiency'}")
         
         return '\n'.join(report)
     
@@ -272,24 +369,36 @@ class ARQAnalyzer:
             }
         }
         
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(_dump_json(data))
         
         print(f"📁 Analysis results exported to {filename}")
 
-def create_performance_visualization():
-    """Create visualizations for protocol performance (requires matplotlib)"""
+def create_performance_visualization(analyzer: ARQAnalyzer = None, print_report: bool = True):
+    """Create visualizations for protocol performance (requires matplotlib)
+    
+    When plotting is not possible the text report is printed instead,
+    unless print_report is False because the caller already showed it.
+    """
+    if analyzer is None:
+        analyzer = ARQAnalyzer()
+    
     if not VISUALIZATION_AVAILABLE:
         print("⚠️  Matplotlib/NumPy not available. Install with: pip install matplotlib numpy")
-        print("📊 Generating text-based visualization instead...")
-        
-        # Text-based visualization
-        analyzer = ARQAnalyzer()
-        print(analyzer.generate_performance_report())
+        if print_report:
+            print("📊 Generating text-based visualization instead...")
+            print(analyzer.generate_performance_report())
         return
     
+    # Fall back to a non-interactive backend when there is no display to draw on
+    headless = (sys.platform.startswith('linux') and
+                not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'))
+    
     try:
-        analyzer = ARQAnalyzer()
+        import matplotlib
+        if headless:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
         
         # Error rate analysis
         error_data = analyzer.analyze_error_rate_impact()
@@ -297,64 +406,47 @@ def create_performance_visualization():
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle('ARQ Protocols Performance Analysis', fontsize=16, fontweight='bold')
         
-        error_rates = [x*100 for x in error_data['error_rates']]
-        
-        # Plot 1: Transmissions vs Error Rate
-        ax1.plot(error_rates, error_data['stop_and_wait']['transmissions'], 'r-o', label='Stop-and-Wait', linewidth=2)
-        ax1.plot(error_rates, error_data['go_back_n']['transmissions'], 'g-s', label='Go-Back-N', linewidth=2)
-        ax1.plot(error_rates, error_data['selective_repeat']['transmissions'], 'b-^', label='Selective Repeat', linewidth=2)
-        ax1.set_xlabel('Error Rate (%)')
-        ax1.set_ylabel('Total Transmissions')
-        ax1.set_title('Total Transmissions vs Error Rate')
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        # Plot 2: Efficiency vs Error Rate
-        ax2.plot(error_rates, error_data['stop_and_wait']['efficiency'], 'r-o', label='Stop-and-Wait', linewidth=2)
-        ax2.plot(error_rates, error_data['go_back_n']['efficiency'], 'g-s', label='Go-Back-N', linewidth=2)
-        ax2.plot(error_rates, error_data['selective_repeat']['efficiency'], 'b-^', label='Selective Repeat', linewidth=2)
-        ax2.set_xlabel('Error Rate (%)')
-        ax2.set_ylabel('Efficiency (%)')
-        ax2.set_title('Protocol Efficiency vs Error Rate')
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        # Plot 3: Throughput vs Error Rate
-        ax3.plot(error_rates, error_data['stop_and_wait']['throughput'], 'r-o', label='Stop-and-Wait', linewidth=2)
-        ax3.plot(error_rates, error_data['go_back_n']['throughput'], 'g-s', label='Go-Back-N', linewidth=2)
-        ax3.plot(error_rates, error_data['selective_repeat']['throughput'], 'b-^', label='Selective Repeat', linewidth=2)
-        ax3.set_xlabel('Error Rate (%)')
-        ax3.set_ylabel('Throughput (frames/sec)')
-        ax3.set_title('Throughput vs Error Rate')
-        ax3.legend()
-        ax3.grid(True, alpha=0.3)
+        error_rates = np.multiply(error_data['error_rates'], 100.0)  # x-axis in percent
+        
+        # Plots 1-3: each metric vs error rate, one line per protocol
+        for ax, metric, ylabel, title in (
+            (ax1, 'transmissions', 'Total Transmissions', 'Total Transmissions vs Error Rate'),
+            (ax2, 'efficiency', 'Efficiency (%)', 'Protocol Efficiency vs Error Rate'),
+            (ax3, 'throughput', 'Throughput (frames/sec)', 'Throughput vs Error Rate')
+        ):
+            for protocol, label, fmt in PLOT_STYLES:
+                ax.plot(error_rates, error_data[protocol][metric], fmt, label=label, linewidth=2)
+            ax.set_xlabel('Error Rate (%)')
+            ax.set_ylabel(ylabel)
+            ax.set_title(title)
         
         # Plot 4: Window Size Impact
         window_data = analyzer.analyze_window_size_impact()
         window_sizes = window_data['window_sizes']
         
-        ax4.plot(window_sizes, window_data['go_back_n']['throughput'], 'g-s', label='Go-Back-N', linewidth=2)
-        ax4.plot(window_sizes, window_data['selective_repeat']['throughput'], 'b-^', label='Selective Repeat', linewidth=2)
+        for protocol, label, fmt in PLOT_STYLES[1:]:
+            ax4.plot(window_sizes, window_data[protocol]['throughput'], fmt, label=label, linewidth=2)
         ax4.set_xlabel('Window Size')
         ax4.set_ylabel('Throughput (frames/sec)')
         ax4.set_title('Throughput vs Window Size')
-        ax4.legend()
-        ax4.grid(True, alpha=0.3)
         ax4.set_xscale('log', base=2)
         
+        for ax in (ax1, ax2, ax3, ax4):
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        
         plt.tight_layout()
         plt.savefig('arq_protocols_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        if not headless:
+            plt.show()
         
         print("📊 Performance visualization saved as 'arq_protocols_analysis.png'")
         
     except Exception as e:
         print(f"⚠️  Error creating visualization: {e}")
-        print("📊 Generating text-based analysis instead...")
-        
-        # Text-based visualization
-        analyzer = ARQAnalyzer()
-        print(analyzer.generate_performance_report())
+        if print_report:
+            print("📊 Generating text-based analysis instead...")
+            print(analyzer.generate_performance_report())
 
 def main():
     """Main analysis function"""
@@ -370,8 +462,9 @@ def main():
     # Export results
     analyzer.export_results()
     
-    # Create visualizations
-    create_performance_visualization()
+    # Create visualizations (reuses the analyses cached above; the text
+    # report has already been printed)
+    create_performance_visualization(analyzer, print_report=False)
 
 if __name__ == "__main__":
     main()
@@ -8,234 +8,314 @@ In this protocol:
 - More efficient than Stop-and-Wait but may retransmit correct frames
 """
 
+import sys
 import time
 import random
-import threading
-from dataclasses import dataclass
-from typing import List, Optional
-from enum import Enum
+import logging
+from functools import lru_cache
+from typing import Iterable, Optional
+from enum import IntEnum
 from collections import deque
+from itertools import islice
 
-class FrameType(Enum):
-    DATA = "DATA"
-    ACK = "ACK"
-    NAK = "NAK"
+log = logging.getLogger(__name__)
+
+MAX_RETRIES = 10  # Total retransmissions per transfer before giving up
+MAX_SEQ_NUM = 8  # Sequence number space (0-7)
+
+class FrameType(IntEnum):
+    # Integer-valued so frame type checks are plain int comparisons;
+    # .name still gives "DATA"/"ACK"/"NAK"
+    DATA = 0
+    ACK = 1
+    NAK = 2
+
+@lru_cache(maxsize=4096)
+def _checksum(data: str) -> int:
+    """Sum of the payload's code points mod 256, memoized per payload"""
+    try:
+        return sum(data.encode('latin-1')) & 0xFF
+    except UnicodeEncodeError:  # Wider code points only contribute their low byte
+        return sum(data.encode('utf-32-le')[::4]) & 0xFF
 
-@dataclass
 class Frame:
-    seq_num: int
-    frame_type: FrameType
-    data: str = ""
-    checksum: int = 0
+    # Plain class so __slots__ can coexist with field defaults on Python < 3.10
+    __slots__ = ('seq_num', 'frame_type', 'data', 'checksum')
     
-    def __post_init__(self):
-        if self.frame_type == FrameType.DATA:
+    def __init__(self, seq_num: int, frame_type: FrameType, data: str = "", checksum: int = 0):
+        self.seq_num = seq_num
+        self.frame_type = frame_type
+        self.data = data
+        self.checksum = checksum
+        if frame_type == FrameType.DATA:
             self.checksum = self.calculate_checksum()
     
+    def __repr__(self):
+        return (f"Frame(seq_num={self.seq_num!r}, frame_type={self.frame_type!r}, "
+                f"data={self.data!r}, checksum={self.checksum!r})")
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.seq_num, self.frame_type, self.data, self.checksum) ==
+                (other.seq_num, other.frame_type, other.data, other.checksum))
+    
+    __hash__ = None  # Mutable, so unhashable
+    
+    @classmethod
+    def make_data(cls, seq_num: int, data: str) -> "Frame":
+        """Build a DATA frame without going through the constructor's type check"""
+        frame = cls.__new__(cls)
+        frame.seq_num = seq_num
+        frame.frame_type = FrameType.DATA
+        frame.data = data
+        frame.checksum = _checksum(data)
+        return frame
+    
     def calculate_checksum(self) -> int:
         """Simple checksum calculation"""
-        return sum(ord(c) for c in self.data) % 256
+        return _checksum(self.data)
     
-    def is_corrupted(self) -> bool:
+    def is_corrupted(self, rng=random) -> bool:
         """Simulate frame corruption during transmission"""
-        return random.random() < 0.1  # 10% corruption rate
+        return rng.random() < 0.1  # 10% corruption rate
 
 class GoBackNSender:
-    def __init__(self, window_size: int = 4, timeout: float = 2.0):
+    def __init__(self, window_size: int = 4, timeout: float = 2.0, real_time: bool = False,
+                 max_timeout: float = 2.0):
+        # A full window of MAX_SEQ_NUM frames would make a repeated ACK look like a new one
+        if not 1 <= window_size < MAX_SEQ_NUM:
+            raise ValueError(f"Go-Back-N window_size must be between 1 and {MAX_SEQ_NUM - 1} "
+                             f"with {MAX_SEQ_NUM} sequence numbers, got {window_size}")
         self.window_size = window_size
         self.timeout = timeout
+        self.max_timeout = max(max_timeout, timeout)  # Backoff ceiling
+        self.rto = timeout  # Current retransmission timeout; backs off on repeated timeouts
+        self.consecutive_timeouts = 0
+        self.real_time = real_time  # Also sleep through simulated delays (demo pacing)
         self.base = 0  # Base of the window
         self.next_seq_num = 0  # Next sequence number to use
-        self.window = {}  # Sent but not acknowledged frames
-        self.data_buffer = deque()  # Buffer for data to send
-        self.max_seq_num = 8  # Sequence number space (0-7)
+        self.window = deque()  # [seq_num, frame, timestamp] of unacked frames, oldest first
+        self.frame_buffer = []  # Frames built for the queued data, in send order
+        self._head = 0  # Index of the next unsent frame in frame_buffer
+        self.max_seq_num = MAX_SEQ_NUM
+        self._seq_mask = self.max_seq_num - 1  # max_seq_num is a power of two
         self.total_transmissions = 0
         self.retransmissions = 0
         self.timer_active = False
-        self.max_retransmissions = 10  # Maximum total retransmissions
+        self.max_retransmissions = MAX_RETRIES  # Maximum total retransmissions
         self.total_retransmission_count = 0  # Track total retransmissions
+        self.virtual_clock = 0.0  # Simulated seconds; timeouts run on this clock
+        self._stats_key = None  # Counter values the cached statistics were built from
+        self._stats = None
         
-    def add_data(self, data_list: List[str]):
-        """Add data to the buffer for transmission"""
-        self.data_buffer.extend(data_list)
-        print(f"📋 Sender: Added {len(data_list)} frames to buffer")
+    def add_data(self, data_list: Iterable[str]):
+        """Add data (any iterable of payloads) to the buffer for transmission"""
+        # Payloads are known up front, so frames (and their checksums) are
+        # built once here and reused by every retransmission
+        mask = self._seq_mask
+        first = len(self.frame_buffer)
+        self.frame_buffer.extend(Frame.make_data((first + i) & mask, data)
+                                 for i, data in enumerate(data_list))
+        log.debug("📋 Sender: Added %s frames to buffer", len(self.frame_buffer) - first)
     
     def can_send(self) -> bool:
         """Check if we can send more frames"""
         return (self.next_seq_num < self.base + self.window_size and 
-                len(self.data_buffer) > 0)
+                self._head < len(self.frame_buffer))
     
-    def send_frames(self, receiver) -> bool:
-        """Send frames using Go-Back-N protocol"""
-        print(f"\n📤 Sender: Starting transmission with window size {self.window_size}")
+    def send_frames(self, receiver, abort=None) -> bool:
+        """Send frames using Go-Back-N protocol
+
+        `abort` is an optional threading.Event; once it is set the
+        transmission loop stops by raising TimeoutError.
+        """
+        log.debug("📤 Sender: Starting transmission with window size %s", self.window_size)
         
         max_iterations = 500  # Prevent infinite loops
         iteration_count = 0
         
-        while (self.data_buffer or self.window) and iteration_count < max_iterations:
+        while (self._head < len(self.frame_buffer) or self.window) and iteration_count < max_iterations:
             iteration_count += 1
+            if abort is not None and abort.is_set():
+                raise TimeoutError("Transmission aborted")
             
-            # Send new frames if window allows
+            # Send new frames if window allows; their ACKs are applied after the burst
+            acks = []
             while self.can_send():
-                data = self.data_buffer.popleft()
-                frame = Frame(self.next_seq_num % self.max_seq_num, FrameType.DATA, data)
+                frame = self.frame_buffer[self._head]
+                self._head += 1
                 
-                print(f"📡 Sender: Sending frame {frame.seq_num} with data '{data}' "
-                      f"(Window: {self.base % self.max_seq_num}-{(self.base + self.window_size - 1) % self.max_seq_num})")
+                log.debug("📡 Sender: Sending frame %s with data '%s' (Window: %s-%s)", frame.seq_num, frame.data,
+                          self.base & self._seq_mask, (self.base + self.window_size - 1) & self._seq_mask)
                 
-                self.window[self.next_seq_num] = {
-                    'frame': frame,
-                    'timestamp': time.time(),
-                    'data': data
-                }
+                self.window.append([self.next_seq_num, frame, self.virtual_clock])
                 
                 self.total_transmissions += 1
                 
                 # Send to receiver
-                ack_num = receiver.receive_frame(frame)
+                acks.append(receiver.receive_frame(frame))
                 
+                self.next_seq_num += 1
+                self.advance_clock(0.1)  # Small delay between transmissions
+            
+            for ack_num in acks:
                 if ack_num is not None:
                     self.process_ack(ack_num)
-                
-                self.next_seq_num += 1
-                time.sleep(0.1)  # Small delay between transmissions
             
-            # Check for timeouts (less frequently)
-            if iteration_count % 3 == 0:  # Check every 3 iterations
-                self.check_timeouts(receiver)
+            # ACKs may have opened the window again
+            if self.can_send():
+                continue
             
             # If no frames in window and no data to send, we're done
-            if not self.window and not self.data_buffer:
+            if not self.window and self._head == len(self.frame_buffer):
                 break
-                
-            time.sleep(0.05)  # Reduced sleep time
+            
+            # With the retransmission budget spent no further event can make progress
+            if self.total_retransmission_count >= self.max_retransmissions:
+                break
+            
+            # ACKs come back synchronously with each send, so the window is
+            # full and the next event is the oldest frame's timeout: jump to it
+            oldest_unacked, _, timestamp = self.window[0]
+            wait = timestamp + self.rto - self.virtual_clock
+            if wait > 0:
+                self.advance_clock(wait)
+            log.debug("⏰ Sender: Timeout detected for frame %s", oldest_unacked & self._seq_mask)
+            self.go_back_n_retransmit(receiver, oldest_unacked)
         
-        if iteration_count >= max_iterations:
-            print(f"⚠️ Sender: Maximum iterations reached, terminating")
-        elif self.total_retransmission_count >= self.max_retransmissions:
-            print(f"⚠️ Sender: Maximum retransmissions reached, terminating")
+        if self.window or self._head < len(self.frame_buffer):
+            if iteration_count >= max_iterations:
+                log.warning("⚠️ Sender: Maximum iterations reached, terminating")
+            else:
+                log.warning("⚠️ Sender: Maximum retransmissions reached, terminating")
+            return False
         
-        print(f"✅ Sender: All frames transmitted successfully")
+        log.debug("✅ Sender: All frames transmitted successfully")
         return True
     
     def process_ack(self, ack_num: int):
         """Process received ACK"""
-        print(f"✅ Sender: Received ACK for frame {ack_num}")
-        
-        # Remove acknowledged frames from window
-        frames_to_remove = []
-        for seq_num in list(self.window.keys()):
-            if self.is_in_range(seq_num, self.base, ack_num):
-                frames_to_remove.append(seq_num)
+        log.debug("✅ Sender: Received ACK for frame %s", ack_num)
         
-        for seq_num in frames_to_remove:
-            if seq_num in self.window:  # Double-check existence
-                del self.window[seq_num]
+        # A cumulative ACK covers the window up to ack_num; anything else
+        # (a repeat ACK for the frame before base) acknowledges nothing new
+        window = self.window
+        acked = ((ack_num - self.base) & self._seq_mask) + 1
+        if acked > len(window):
+            log.debug("🔁 Sender: Duplicate ACK %s ignored", ack_num)
+            return
         
-        # Update base
-        if frames_to_remove:
-            self.base = max(frames_to_remove) + 1
-            print(f"🔄 Sender: Window moved, new base: {self.base % self.max_seq_num}")
-    
-    def is_in_range(self, seq_num: int, start: int, end: int) -> bool:
-        """Check if sequence number is in range [start, end]"""
-        if start <= end:
-            return start <= seq_num <= end
-        else:  # Wrap around case
-            return seq_num >= start or seq_num <= end
-    
-    def check_timeouts(self, receiver):
-        """Check for timeouts and retransmit if necessary"""
-        current_time = time.time()
-        oldest_unacked = min(self.window.keys()) if self.window else None
+        for _ in range(acked):
+            self.base = window.popleft()[0] + 1
         
-        if (oldest_unacked is not None and 
-            current_time - self.window[oldest_unacked]['timestamp'] > self.timeout):
-            
-            print(f"⏰ Sender: Timeout detected for frame {oldest_unacked % self.max_seq_num}")
-            self.go_back_n_retransmit(receiver, oldest_unacked)
+        log.debug("🔄 Sender: Window moved, new base: %s", self.base & self._seq_mask)
+        # Progress: drop back to the base timeout
+        self.consecutive_timeouts = 0
+        self.rto = self.timeout
     
     def go_back_n_retransmit(self, receiver, failed_seq_num: int):
         """Retransmit from failed frame onwards (Go-Back-N behavior)"""
-        print(f"🔄 Sender: Go-Back-N retransmission starting from frame {failed_seq_num % self.max_seq_num}")
+        log.debug("🔄 Sender: Go-Back-N retransmission starting from frame %s", failed_seq_num & self._seq_mask)
         
         # Check if we've exceeded retransmission limit
         if self.total_retransmission_count >= self.max_retransmissions:
-            print(f"🚫 Sender: Maximum retransmissions ({self.max_retransmissions}) reached, stopping")
+            log.debug("🚫 Sender: Maximum retransmissions (%s) reached, stopping", self.max_retransmissions)
             return
         
-        # Get all frames to retransmit (from failed frame onwards)
-        frames_to_retransmit = []
-        for seq_num in sorted(self.window.keys()):
-            if seq_num >= failed_seq_num:
-                frames_to_retransmit.append(seq_num)
+        # Back off: the resent frames wait twice as long before the next timeout
+        self.consecutive_timeouts += 1
+        self.rto = self.backoff_timeout(self.consecutive_timeouts)
         
-        # Limit the number of frames to retransmit to prevent excessive load
-        frames_to_retransmit = frames_to_retransmit[:self.window_size]
+        # Get all frames to retransmit (from failed frame onwards), limited
+        # to one window to prevent excessive load
+        frames_to_retransmit = [entry for entry in islice(self.window, self.window_size)
+                                if entry[0] >= failed_seq_num]
         
         # Retransmit frames
-        for seq_num in frames_to_retransmit:
-            if seq_num not in self.window:  # Check if frame still exists
+        for entry in frames_to_retransmit:
+            seq_num, frame, _ = entry
+            if seq_num < self.base:  # Already acknowledged during this round
                 continue
-                
-            frame_info = self.window[seq_num]
-            frame = frame_info['frame']
             
-            print(f"📡 Sender: Retransmitting frame {frame.seq_num} with data '{frame.data}'")
+            log.debug("📡 Sender: Retransmitting frame %s with data '%s'", frame.seq_num, frame.data)
             self.total_transmissions += 1
             self.retransmissions += 1
             self.total_retransmission_count += 1
             
             # Check retransmission limit during the loop
             if self.total_retransmission_count >= self.max_retransmissions:
-                print(f"🚫 Sender: Retransmission limit reached during Go-Back-N")
+                log.warning("🚫 Sender: Retransmission limit reached during Go-Back-N")
                 break
             
             # Update timestamp
-            self.window[seq_num]['timestamp'] = time.time()
+            entry[2] = self.virtual_clock
             
             # Send to receiver
             ack_num = receiver.receive_frame(frame)
             if ack_num is not None:
                 self.process_ack(ack_num)
             
-            time.sleep(0.1)
+            self.advance_clock(0.1)
+    
+    def backoff_timeout(self, attempts: int) -> float:
+        """Retransmission timeout after `attempts` consecutive timeouts (doubling, capped)"""
+        return min(self.timeout * (1 << min(attempts, 6)), self.max_timeout)
+    
+    def advance_clock(self, seconds: float):
+        """Move the simulated clock forward, sleeping too in real-time mode"""
+        self.virtual_clock += seconds
+        if self.real_time:
+            time.sleep(seconds)
     
     def get_statistics(self):
-        return {
-            "total_transmissions": self.total_transmissions,
-            "retransmissions": self.retransmissions,
-            "efficiency": f"{((self.total_transmissions - self.retransmissions) / self.total_transmissions * 100):.1f}%" if self.total_transmissions > 0 else "0%"
-        }
+        # Rebuilt only when a counter has moved since the last call
+        key = (self.total_transmissions, self.retransmissions)
+        if key != self._stats_key:
+            self._stats_key = key
+            efficiency = ((self.total_transmissions - self.retransmissions) / self.total_transmissions * 100) if self.total_transmissions > 0 else 0.0
+            self._stats = {
+                "total_transmissions": self.total_transmissions,
+                "retransmissions": self.retransmissions,
+                "efficiency": efficiency,
+                "efficiency_str": f"{efficiency:.1f}%"
+            }
+        return self._stats
 
 class GoBackNReceiver:
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random  # Loss/corruption draws (global stream by default)
+        self._draw = self.rng.random  # Bound once; called for every frame and ACK
         self.expected_seq_num = 0
-        self.max_seq_num = 8
+        self.max_seq_num = MAX_SEQ_NUM
+        self._seq_mask = self.max_seq_num - 1
         self.received_frames = []
+        self._received_count = 0
         self.total_frames_received = 0
         self.frames_discarded = 0
         
     def receive_frame(self, frame: Frame) -> Optional[int]:
         """Receive and process a frame"""
         self.total_frames_received += 1
-        print(f"📥 Receiver: Received frame {frame.seq_num}")
+        log.debug("📥 Receiver: Received frame %s", frame.seq_num)
         
         # Simulate frame loss during transmission
-        if random.random() < 0.15:  # 15% frame loss rate
-            print(f"📦 Receiver: Frame {frame.seq_num} lost during transmission")
+        if self._draw() < 0.15:  # 15% frame loss rate
+            log.debug("📦 Receiver: Frame %s lost during transmission", frame.seq_num)
             return None
         
         # Check for corruption
-        if frame.is_corrupted():
-            print(f"💥 Receiver: Frame {frame.seq_num} is corrupted")
+        if frame.is_corrupted(self.rng):
+            log.debug("💥 Receiver: Frame %s is corrupted", frame.seq_num)
             self.frames_discarded += 1
             return None
         
         # Check if this is the expected frame
-        if frame.seq_num == self.expected_seq_num % self.max_seq_num:
-            print(f"✅ Receiver: Frame {frame.seq_num} accepted - Data: '{frame.data}'")
+        expected = self.expected_seq_num & self._seq_mask
+        if frame.seq_num == expected:
+            log.debug("✅ Receiver: Frame %s accepted - Data: '%s'", frame.seq_num, frame.data)
             self.received_frames.append(frame.data)
+            self._received_count += 1
             self.expected_seq_num += 1
             
             # Send ACK
@@ -243,12 +323,12 @@ class GoBackNReceiver:
             if self.send_ack(ack_num):
                 return ack_num
         else:
-            print(f"❌ Receiver: Frame {frame.seq_num} out of order (expected {self.expected_seq_num % self.max_seq_num}), discarded")
+            log.debug("❌ Receiver: Frame %s out of order (expected %s), discarded", frame.seq_num, expected)
             self.frames_discarded += 1
             
             # Send ACK for the last correctly received frame
             if self.expected_seq_num > 0:
-                last_correct_frame = (self.expected_seq_num - 1) % self.max_seq_num
+                last_correct_frame = (self.expected_seq_num - 1) & self._seq_mask
                 if self.send_ack(last_correct_frame):
                     return last_correct_frame
         
@@ -257,30 +337,39 @@ class GoBackNReceiver:
     def send_ack(self, seq_num: int) -> bool:
         """Send acknowledgment"""
         # Simulate ACK loss
-        if random.random() < 0.1:  # 10% ACK loss rate
-            print(f"📤 Receiver: ACK for frame {seq_num} sent but lost")
+        if self._draw() < 0.1:  # 10% ACK loss rate
+            log.debug("📤 Receiver: ACK for frame %s sent but lost", seq_num)
             return False
-        print(f"📤 Receiver: ACK sent for frame {seq_num}")
+        log.debug("📤 Receiver: ACK sent for frame %s", seq_num)
         return True
     
     def get_received_data(self):
         return self.received_frames
     
+    @property
+    def received_count(self) -> int:
+        """Number of frames delivered in order so far"""
+        return self._received_count
+    
     def get_statistics(self):
         return {
             "frames_received": self.total_frames_received,
             "frames_discarded": self.frames_discarded,
-            "frames_accepted": len(self.received_frames)
+            "frames_accepted": self._received_count
         }
 
 def demonstrate_go_back_n():
     """Demonstrate Go-Back-N ARQ protocol"""
+    # Show the per-frame protocol trace
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
+    log.setLevel(logging.DEBUG)
+    
     print("=" * 60)
     print("GO-BACK-N ARQ PROTOCOL SIMULATION")
     print("=" * 60)
     
     window_size = 4
-    sender = GoBackNSender(window_size=window_size, timeout=1.5)
+    sender = GoBackNSender(window_size=window_size, timeout=1.5, real_time=True)
     receiver = GoBackNReceiver()
     
     # Test data to send
@@ -308,8 +397,9 @@ def demonstrate_go_back_n():
     print(f"📊 Frames discarded by receiver: {receiver_stats['frames_discarded']}")
     print(f"📊 Total transmission attempts: {sender_stats['total_transmissions']}")
     print(f"📊 Retransmissions: {sender_stats['retransmissions']}")
-    print(f"📊 Protocol efficiency: {sender_stats['efficiency']}")
+    print(f"📊 Protocol efficiency: {sender_stats['efficiency_str']}")
     print(f"📊 Total simulation time: {end_time - start_time:.2f} seconds")
+    print(f"📊 Simulated channel time: {sender.virtual_clock:.2f} seconds")
     print(f"📊 Received data: {receiver.get_received_data()}")
     
     # Protocol characteristics
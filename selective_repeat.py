@@ -8,349 +8,598 @@ In this protocol:
 - Most efficient but requires more complex buffer management
 """
 
+import sys
 import time
 import random
-import threading
-from dataclasses import dataclass
-from typing import List, Optional, Dict
-from enum import Enum
-from collections import deque
+import logging
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Dict, Tuple, Union
+from enum import IntEnum
+from array import array
+from itertools import islice
+import heapq
 
-class FrameType(Enum):
-    DATA = "DATA"
-    ACK = "ACK"
-    NAK = "NAK"
+log = logging.getLogger(__name__)
+
+MAX_RETRIES = 5  # Retransmissions per frame before giving up
+DUP_ACK_THRESHOLD = 3  # ACKs past a missing frame that trigger its fast retransmit
+MAX_SEQ_NUM = 8  # Sequence number space (0-7)
+
+def _check_window_size(window_size: int):
+    """Selective Repeat needs window_size <= MAX_SEQ_NUM / 2 so old and new frames never share a number"""
+    if not 1 <= window_size <= MAX_SEQ_NUM // 2:
+        raise ValueError(f"Selective Repeat window_size must be between 1 and {MAX_SEQ_NUM // 2} "
+                         f"with {MAX_SEQ_NUM} sequence numbers, got {window_size}")
+
+class FrameType(IntEnum):
+    # Integer-valued so frame type checks are plain int comparisons;
+    # .name still gives "DATA"/"ACK"/"NAK"
+    DATA = 0
+    ACK = 1
+    NAK = 2
+
+@lru_cache(maxsize=4096)
+def _checksum(data: str) -> int:
+    """Sum of the payload's code points mod 256, memoized per payload"""
+    try:
+        return sum(data.encode('latin-1')) & 0xFF
+    except UnicodeEncodeError:  # Wider code points only contribute their low byte
+        return sum(data.encode('utf-32-le')[::4]) & 0xFF
 
-@dataclass
 class Frame:
-    seq_num: int
-    frame_type: FrameType
-    data: str = ""
-    checksum: int = 0
+    # Plain class so __slots__ can coexist with field defaults on Python < 3.10
+    __slots__ = ('seq_num', 'frame_type', 'data', 'checksum')
     
-    def __post_init__(self):
-        if self.frame_type == FrameType.DATA:
+    def __init__(self, seq_num: int, frame_type: FrameType, data: str = "", checksum: int = 0):
+        self.seq_num = seq_num
+        self.frame_type = frame_type
+        self.data = data
+        self.checksum = checksum
+        if frame_type == FrameType.DATA:
             self.checksum = self.calculate_checksum()
     
+    def __repr__(self):
+        return (f"Frame(seq_num={self.seq_num!r}, frame_type={self.frame_type!r}, "
+                f"data={self.data!r}, checksum={self.checksum!r})")
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.seq_num, self.frame_type, self.data, self.checksum) ==
+                (other.seq_num, other.frame_type, other.data, other.checksum))
+    
+    __hash__ = None  # Mutable, so unhashable
+    
+    @classmethod
+    def make_data(cls, seq_num: int, data: str) -> "Frame":
+        """Build a DATA frame without going through the constructor's type check"""
+        frame = cls.__new__(cls)
+        frame.seq_num = seq_num
+        frame.frame_type = FrameType.DATA
+        frame.data = data
+        frame.checksum = _checksum(data)
+        return frame
+    
     def calculate_checksum(self) -> int:
         """Simple checksum calculation"""
-        return sum(ord(c) for c in self.data) % 256
+        return _checksum(self.data)
     
-    def is_corrupted(self) -> bool:
+    def is_corrupted(self, rng=random) -> bool:
         """Simulate frame corruption during transmission"""
-        return random.random() < 0.1  # 10% corruption rate
+        return rng.random() < 0.1  # 10% corruption rate
 
 class SelectiveRepeatSender:
-    def __init__(self, window_size: int = 4, timeout: float = 2.0):
+    def __init__(self, window_size: int = 4, timeout: float = 2.0, real_time: bool = False,
+                 max_timeout: float = 2.0):
+        _check_window_size(window_size)
         self.window_size = window_size
         self.timeout = timeout
+        self.max_timeout = max(max_timeout, timeout)  # Backoff ceiling
+        self.real_time = real_time  # Also sleep through simulated delays (demo pacing)
+        self.virtual_clock = 0.0  # Simulated seconds; timers run on this clock
         self.base = 0  # Base of the window
         self.next_seq_num = 0  # Next sequence number to use
-        self.window = {}  # Sent but not acknowledged frames
-        self.ack_received = set()  # Set of acknowledged sequence numbers
-        self.data_buffer = deque()  # Buffer for data to send
-        self.max_seq_num = 8  # Sequence number space (0-7)
+        self.data_buffer = []  # Buffer for data to send
+        self._head = 0  # Index of the next unsent entry in data_buffer
+        self.max_seq_num = MAX_SEQ_NUM
+        self._seq_mask = self.max_seq_num - 1  # max_seq_num is a power of two
         self.total_transmissions = 0
         self.retransmissions = 0
-        self.individual_timers = {}  # Individual timers for each frame
-        self.max_retransmissions = 5  # Maximum retransmissions per frame
-        self.retransmit_count = {}  # Track retransmission count per frame
+        self.max_retransmissions = MAX_RETRIES  # Maximum retransmissions per frame
+        self.failed_seq = None  # Frame that exhausted its retransmissions; ends the transfer
+        self._stats_key = None  # Counter values the cached statistics were built from
+        self._stats = None
+        
+        # Circular window state, one slot per outstanding frame (seq % window_size)
+        self.ring = [None] * window_size  # Sent but not acknowledged frames
+        self.timers = array('d', [0.0] * window_size)  # Timer deadline for each slot
+        self.retx = array('B', [0] * window_size)  # Retransmission count per slot
+        self.ack_bitmap = 0  # Bit idx set once the frame in slot idx is resolved
+        self.in_flight = 0  # Number of occupied slots
+        self.timer_heap = []  # (deadline, seq_num) min-heap; stale entries skipped lazily
         
-    def add_data(self, data_list: List[str]):
-        """Add data to the buffer for transmission"""
+        # Fast retransmit: ACKs for later frames while one is still missing
+        self.hole = -1  # Sequence number of the missing frame being counted against
+        self.dup_acks = 0
+        self.fast_retransmit_due = False
+        self.fast_retransmissions = 0
+        
+    def add_data(self, data_list: Iterable[str]):
+        """Add data (any iterable of payloads) to the buffer for transmission"""
+        first = len(self.data_buffer)
         self.data_buffer.extend(data_list)
-        print(f"📋 Sender: Added {len(data_list)} frames to buffer")
+        log.debug("📋 Sender: Added %s frames to buffer", len(self.data_buffer) - first)
     
     def can_send(self) -> bool:
         """Check if we can send more frames"""
         return (self.next_seq_num < self.base + self.window_size and 
-                len(self.data_buffer) > 0)
+                self._head < len(self.data_buffer))
     
-    def send_frames(self, receiver) -> bool:
-        """Send frames using Selective Repeat protocol"""
-        print(f"\n📤 Sender: Starting transmission with window size {self.window_size}")
+    def send_frames(self, receiver, abort=None) -> bool:
+        """Send frames using Selective Repeat protocol
+
+        `abort` is an optional threading.Event; once it is set the
+        transmission loop stops by raising TimeoutError.
+        """
+        log.debug("📤 Sender: Starting transmission with window size %s", self.window_size)
         
         max_iterations = 1000  # Prevent infinite loops
         iteration_count = 0
+        trace = log.isEnabledFor(logging.DEBUG)
         
-        while (self.data_buffer or self.window) and iteration_count < max_iterations:
+        # Bind loop-invariant state to locals; the hot loop only reads these
+        buf = self.data_buffer
+        n_data = len(buf)
+        head = self._head
+        ws = self.window_size
+        mask = self._seq_mask
+        ring = self.ring
+        retx = self.retx
+        make_data = Frame.make_data
+        receive = receiver.receive_frame
+        handle_response = self.handle_response
+        start_timer = self.start_timer
+        advance_clock = self.advance_clock
+        
+        while (head < n_data or self.in_flight) and iteration_count < max_iterations:
             iteration_count += 1
+            if abort is not None and abort.is_set():
+                raise TimeoutError("Transmission aborted")
+            
+            # The window only slides between bursts, so its bounds are fixed here
+            base = self.base
+            if trace:
+                win_lo = base & mask
+                win_hi = (base + ws - 1) & mask
             
             # Send new frames if window allows
-            while self.can_send():
-                data = self.data_buffer.popleft()
-                frame = Frame(self.next_seq_num % self.max_seq_num, FrameType.DATA, data)
+            next_sn = self.next_seq_num
+            while next_sn < base + ws and head < n_data:
+                data = buf[head]
+                head += 1
+                frame = make_data(next_sn & mask, data)
                 
-                print(f"📡 Sender: Sending frame {frame.seq_num} with data '{data}' "
-                      f"(Window: {self.base % self.max_seq_num}-{(self.base + self.window_size - 1) % self.max_seq_num})")
+                if trace:
+                    log.debug("📡 Sender: Sending frame %s with data '%s' (Window: %s-%s)",
+                              frame.seq_num, data, win_lo, win_hi)
                 
-                self.window[self.next_seq_num] = {
-                    'frame': frame,
-                    'timestamp': time.time(),
-                    'data': data
-                }
-                
-                # Start individual timer for this frame
-                self.individual_timers[self.next_seq_num] = time.time()
+                # Occupy the frame's slot and start its individual timer
+                idx = next_sn % ws
+                ring[idx] = frame
+                retx[idx] = 0
+                start_timer(next_sn)
+                self.ack_bitmap &= ~(1 << idx)
+                self.in_flight += 1
                 
                 self.total_transmissions += 1
                 
-                # Send to receiver
-                ack_nums = receiver.receive_frame(frame)
-                
-                if ack_nums:
-                    for ack_num in ack_nums:
-                        self.process_ack(ack_num)
+                # Send to receiver; ACK handling reads next_seq_num, so it is
+                # advanced only after the response is processed
+                handle_response(receive(frame))
                 
-                self.next_seq_num += 1
-                time.sleep(0.1)  # Small delay between transmissions
+                next_sn += 1
+                self.next_seq_num = next_sn
+                advance_clock(0.1)  # Small delay between transmissions
+            self._head = head
+            
+            # Resend a frame the ACKs show missing before its timer runs out
+            if self.fast_retransmit_due:
+                self.fast_retransmit(receiver)
+            
+            # Retransmit frames whose individual timers have expired
+            self.check_individual_timeouts(receiver)
             
-            # Check for individual frame timeouts (less frequently)
-            if iteration_count % 5 == 0:  # Check timeouts every 5 iterations
-                self.check_individual_timeouts(receiver)
+            # A frame the receiver never got cannot be skipped: sliding past it
+            # would let later frames alias its sequence number at the receiver
+            if self.failed_seq is not None:
+                break
             
             # Try to slide the window
             self.slide_window()
             
             # If no frames in window and no data to send, we're done
-            if not self.window and not self.data_buffer:
+            if not self.in_flight and head == n_data:
                 break
                 
-            time.sleep(0.05)  # Reduced sleep time
+            advance_clock(0.05)  # Idle time between polls
         
+        if self.failed_seq is not None:
+            log.warning("❌ Sender: Transfer aborted, frame %s was never acknowledged", self.failed_seq & self._seq_mask)
+            return False
         if iteration_count >= max_iterations:
-            print(f"⚠️ Sender: Maximum iterations reached, terminating")
+            log.warning("⚠️ Sender: Maximum iterations reached, terminating")
+            return False
         
-        print(f"✅ Sender: All frames transmitted successfully")
+        log.debug("✅ Sender: All frames transmitted successfully")
         return True
     
+    def handle_response(self, response):
+        """Apply a receiver reply: a list of ACKs or a (cum_ack, sack_bitmap) pair"""
+        if not response:
+            return
+        if isinstance(response, tuple):
+            self.process_sack(*response)
+        else:
+            for ack_num in response:
+                self.process_ack(ack_num)
+    
+    def process_sack(self, cum_ack: int, sack_bitmap: int):
+        """Process a selective ACK: everything before cum_ack plus the bitmap's frames"""
+        log.debug("✅ Sender: Received SACK (next %s, bitmap %s)", cum_ack, bin(sack_bitmap))
+        
+        cum_seq = self.base + ((cum_ack - self.base) & self._seq_mask)
+        if cum_seq > self.next_seq_num:
+            return  # Receiver is behind our window; nothing to learn
+        
+        for seq_num in range(self.base, cum_seq):
+            self.release_slot(seq_num % self.window_size)
+        
+        # Frames reported past cum_ack while it is still missing
+        if sack_bitmap and cum_seq < self.next_seq_num:
+            self.count_dup_ack(cum_seq)
+        
+        seq_num = cum_seq
+        while sack_bitmap and seq_num < self.next_seq_num:
+            if sack_bitmap & 1:
+                self.release_slot(seq_num % self.window_size)
+            sack_bitmap >>= 1
+            seq_num += 1
+    
     def process_ack(self, ack_num: int):
         """Process received ACK for individual frame"""
-        print(f"✅ Sender: Received ACK for frame {ack_num}")
+        log.debug("✅ Sender: Received ACK for frame %s", ack_num)
+        
+        # Map the wrapped ACK number back onto the outstanding sequence range
+        seq_num = self.base + ((ack_num - self.base) & self._seq_mask)
+        if seq_num >= self.next_seq_num:
+            return
         
-        # Mark frame as acknowledged
-        self.ack_received.add(ack_num)
+        # An ACK past an unacknowledged base hints that the base frame was lost
+        if seq_num > self.base and not self.ack_bitmap & (1 << (self.base % self.window_size)):
+            self.count_dup_ack(self.base)
         
-        # Remove from window if present
-        seq_nums_to_remove = [seq_num for seq_num in self.window.keys() 
-                             if seq_num % self.max_seq_num == ack_num]
+        # Mark frame as acknowledged and release its slot
+        self.release_slot(seq_num % self.window_size)
+    
+    def count_dup_ack(self, hole: int):
+        """Count an ACK beyond a missing frame; flag it for fast retransmit at the threshold"""
+        if hole != self.hole:
+            self.hole = hole
+            self.dup_acks = 0
+        self.dup_acks += 1
+        if self.dup_acks == DUP_ACK_THRESHOLD:
+            self.fast_retransmit_due = True
+    
+    def fast_retransmit(self, receiver):
+        """Retransmit the missing frame without waiting for its timer"""
+        self.fast_retransmit_due = False
+        seq_num = self.hole
+        idx = seq_num % self.window_size
+        if seq_num < self.base or self.ring[idx] is None or self.ack_bitmap & (1 << idx):
+            return  # Resolved since the duplicate ACKs arrived
         
-        for seq_num in seq_nums_to_remove:
-            if seq_num in self.window:
-                del self.window[seq_num]
-            if seq_num in self.individual_timers:
-                del self.individual_timers[seq_num]
-            if seq_num in self.retransmit_count:
-                del self.retransmit_count[seq_num]
+        log.debug("⚡ Sender: Fast retransmit of frame %s after %s duplicate ACKs",
+                  seq_num & self._seq_mask, self.dup_acks)
+        self.fast_retransmissions += 1
+        self.selective_retransmit(receiver, seq_num)
+    
+    def release_slot(self, idx: int):
+        """Stop tracking the frame held in a window slot"""
+        if self.ring[idx] is not None:
+            self.ring[idx] = None
+            self.in_flight -= 1
+        self.ack_bitmap |= 1 << idx
     
     def slide_window(self):
         """Slide the window forward if possible"""
         original_base = self.base
         
         # Advance base to the first unacknowledged frame
-        while self.base % self.max_seq_num in self.ack_received:
-            self.ack_received.remove(self.base % self.max_seq_num)
+        while self.base < self.next_seq_num:
+            idx = self.base % self.window_size
+            bit = 1 << idx
+            if not self.ack_bitmap & bit:
+                break
+            self.ack_bitmap &= ~bit
+            self.retx[idx] = 0
+            self.ring[idx] = None
             self.base += 1
         
         if self.base != original_base:
-            print(f"🔄 Sender: Window slid forward, new base: {self.base % self.max_seq_num}")
+            log.debug("🔄 Sender: Window slid forward, new base: %s", self.base & self._seq_mask)
+    
+    def start_timer(self, seq_num: int):
+        """(Re)start the individual timer for a frame, backing off per retransmission"""
+        idx = seq_num % self.window_size
+        deadline = self.virtual_clock + self.backoff_timeout(self.retx[idx])
+        self.timers[idx] = deadline
+        heapq.heappush(self.timer_heap, (deadline, seq_num))
     
     def check_individual_timeouts(self, receiver):
-        """Check for individual frame timeouts and retransmit only those frames"""
-        current_time = time.time()
-        frames_to_retransmit = []
-        
-        for seq_num, timestamp in list(self.individual_timers.items()):
-            if current_time - timestamp > self.timeout:
-                frames_to_retransmit.append(seq_num)
+        """Retransmit only the frames whose individual timers have expired"""
+        current_time = self.virtual_clock
+        heap = self.timer_heap
         
-        # Retransmit timed-out frames (only if they're still in the window)
-        for seq_num in frames_to_retransmit:
-            if seq_num in self.window and seq_num < self.base + self.window_size:
-                self.selective_retransmit(receiver, seq_num)
+        while heap and heap[0][0] <= current_time and self.failed_seq is None:
+            deadline, seq_num = heapq.heappop(heap)
+            idx = seq_num % self.window_size
+            
+            # Skip entries left behind by ACKs, slides and restarted timers
+            if self.ring[idx] is None or seq_num < self.base or self.timers[idx] != deadline:
+                continue
+            
+            self.selective_retransmit(receiver, seq_num)
     
     def selective_retransmit(self, receiver, seq_num: int):
         """Retransmit only the specific frame (Selective Repeat behavior)"""
-        if seq_num not in self.window:  # Check if frame still exists
+        idx = seq_num % self.window_size
+        frame = self.ring[idx]
+        if frame is None:  # Check if frame still exists
             return
             
         # Don't retransmit if frame is outside current window
         if seq_num < self.base or seq_num >= self.base + self.window_size:
-            print(f"🚫 Sender: Frame {seq_num % self.max_seq_num} outside window, stopping retransmission")
-            # Remove from window and timers
-            if seq_num in self.window:
-                del self.window[seq_num]
-            if seq_num in self.individual_timers:
-                del self.individual_timers[seq_num]
-            if seq_num in self.retransmit_count:
-                del self.retransmit_count[seq_num]
+            log.debug("🚫 Sender: Frame %s outside window, stopping retransmission", seq_num & self._seq_mask)
+            self.release_slot(idx)
             return
         
         # Check retransmission limit
-        if seq_num not in self.retransmit_count:
-            self.retransmit_count[seq_num] = 0
-        
-        if self.retransmit_count[seq_num] >= self.max_retransmissions:
-            print(f"🚫 Sender: Frame {seq_num % self.max_seq_num} exceeded max retransmissions, giving up")
-            # Remove from window and timers
-            if seq_num in self.window:
-                del self.window[seq_num]
-            if seq_num in self.individual_timers:
-                del self.individual_timers[seq_num]
-            if seq_num in self.retransmit_count:
-                del self.retransmit_count[seq_num]
+        if self.retx[idx] >= self.max_retransmissions:
+            # The frame stays unacknowledged so the window cannot slide past it
+            log.warning("🚫 Sender: Frame %s exceeded max retransmissions, giving up", seq_num & self._seq_mask)
+            self.failed_seq = seq_num
             return
-            
-        frame_info = self.window[seq_num]
-        frame = frame_info['frame']
         
-        print(f"🔄 Sender: Selective retransmission of frame {frame.seq_num} with data '{frame.data}' (attempt {self.retransmit_count[seq_num] + 1})")
+        log.debug("🔄 Sender: Selective retransmission of frame %s with data '%s' (attempt %s)", frame.seq_num, frame.data, self.retx[idx] + 1)
         self.total_transmissions += 1
         self.retransmissions += 1
-        self.retransmit_count[seq_num] += 1
+        self.retx[idx] += 1
         
-        # Update timestamp and timer
-        self.window[seq_num]['timestamp'] = time.time()
-        self.individual_timers[seq_num] = time.time()
+        # Restart the frame's timer
+        self.start_timer(seq_num)
         
         # Send to receiver
-        ack_nums = receiver.receive_frame(frame)
-        if ack_nums:
-            for ack_num in ack_nums:
-                self.process_ack(ack_num)
+        self.handle_response(receiver.receive_frame(frame))
         
-        time.sleep(0.1)
+        self.advance_clock(0.1)
+    
+    def backoff_timeout(self, attempts: int) -> float:
+        """Retransmission timeout after `attempts` consecutive timeouts (doubling, capped)"""
+        return min(self.timeout * (1 << min(attempts, 6)), self.max_timeout)
+    
+    def advance_clock(self, seconds: float):
+        """Move the simulated clock forward, sleeping too in real-time mode"""
+        self.virtual_clock += seconds
+        if self.real_time:
+            time.sleep(seconds)
     
     def get_statistics(self):
-        return {
-            "total_transmissions": self.total_transmissions,
-            "retransmissions": self.retransmissions,
-            "efficiency": f"{((self.total_transmissions - self.retransmissions) / self.total_transmissions * 100):.1f}%" if self.total_transmissions > 0 else "0%"
-        }
+        # Rebuilt only when a counter has moved since the last call
+        key = (self.total_transmissions, self.retransmissions)
+        if key != self._stats_key:
+            self._stats_key = key
+            efficiency = ((self.total_transmissions - self.retransmissions) / self.total_transmissions * 100) if self.total_transmissions > 0 else 0.0
+            self._stats = {
+                "total_transmissions": self.total_transmissions,
+                "retransmissions": self.retransmissions,
+                "efficiency": efficiency,
+                "efficiency_str": f"{efficiency:.1f}%"
+            }
+        return self._stats
 
 class SelectiveRepeatReceiver:
-    def __init__(self, window_size: int = 4):
+    def __init__(self, window_size: int = 4, rng: Optional[random.Random] = None,
+                 sack_mode: bool = False, expected_count: Optional[int] = None):
+        _check_window_size(window_size)
+        self.rng = rng if rng is not None else random  # Loss/corruption draws (global stream by default)
+        self._draw = self.rng.random  # Bound once; called for every frame and ACK
         self.window_size = window_size
+        self.sack_mode = sack_mode  # Reply with one (cum_ack, sack_bitmap) instead of per-frame ACKs
+        self.sack_bits = 0  # Bit i set when frame base+i is buffered out of order
         self.base = 0  # Base of receiver window
-        self.max_seq_num = 8
-        self.buffer = {}  # Buffer for out-of-order frames
-        self.received_frames = []  # Final ordered sequence
+        self.max_seq_num = MAX_SEQ_NUM
+        self._seq_mask = self.max_seq_num - 1
+        self.slots = [None] * self.max_seq_num  # Out-of-order frame data, indexed by seq_num
+        self.present = bytearray(self.max_seq_num)  # 1 where slots[i] holds an undelivered frame
+        self._buffered = 0
+        # Final ordered sequence; preallocated when the message length is known
+        self.received_frames = [None] * expected_count if expected_count else []
+        self._received_count = 0
         self.total_frames_received = 0
         self.frames_discarded = 0
         self.duplicate_frames = 0
         
-    def receive_frame(self, frame: Frame) -> Optional[List[int]]:
-        """Receive and process a frame"""
+    def receive_frame(self, frame: Frame) -> Optional[Union[List[int], Tuple[int, int]]]:
+        """Receive and process a frame
+        
+        Returns the list of ACKed sequence numbers, or in SACK mode a single
+        (cum_ack, sack_bitmap) pair; None when nothing reaches the sender.
+        """
         self.total_frames_received += 1
-        print(f"📥 Receiver: Received frame {frame.seq_num}")
+        log.debug("📥 Receiver: Received frame %s", frame.seq_num)
         
         # Simulate frame loss during transmission
-        if random.random() < 0.15:  # 15% frame loss rate
-            print(f"📦 Receiver: Frame {frame.seq_num} lost during transmission")
+        if self._draw() < 0.15:  # 15% frame loss rate
+            log.debug("📦 Receiver: Frame %s lost during transmission", frame.seq_num)
             return None
         
         # Check for corruption
-        if frame.is_corrupted():
-            print(f"💥 Receiver: Frame {frame.seq_num} is corrupted")
+        if frame.is_corrupted(self.rng):
+            log.debug("💥 Receiver: Frame %s is corrupted", frame.seq_num)
             self.frames_discarded += 1
             return None
         
-        # Check if frame is within receiver window
-        if self.is_in_window(frame.seq_num):
-            if frame.seq_num in self.buffer:
-                print(f"🔄 Receiver: Duplicate frame {frame.seq_num}, sending ACK")
-                self.duplicate_frames += 1
-            else:
-                print(f"✅ Receiver: Frame {frame.seq_num} buffered - Data: '{frame.data}'")
-                self.buffer[frame.seq_num] = frame.data
-            
-            # Send ACK for this specific frame
+        # Fast path: window check, buffering, ACK and in-order delivery inline
+        seq_num = frame.seq_num
+        mask = self._seq_mask
+        offset = (seq_num - self.base) & mask
+        if offset >= self.window_size:
+            return self._receive_outside_window(seq_num)
+        
+        idx = seq_num & mask
+        if self.present[idx]:
+            log.debug("🔄 Receiver: Duplicate frame %s, sending ACK", seq_num)
+            self.duplicate_frames += 1
+        else:
+            log.debug("✅ Receiver: Frame %s buffered - Data: '%s'", seq_num, frame.data)
+            self.slots[idx] = frame.data
+            self.present[idx] = 1
+            self._buffered += 1
+            self.sack_bits |= 1 << offset
+        
+        if self.sack_mode:
+            if offset == 0:
+                self.deliver_frames()
+            return self.send_sack()
+        
+        # Send ACK for this specific frame (10% ACK loss rate)
+        if self._draw() < 0.1:
+            log.debug("📤 Receiver: ACK for frame %s sent but lost", seq_num)
             ack_nums = []
-            if self.send_ack(frame.seq_num):
-                ack_nums.append(frame.seq_num)
-            
-            # Try to deliver frames in order
-            delivered_frames = self.deliver_frames()
-            return ack_nums + delivered_frames
         else:
-            # Frame outside window
-            if self.is_already_delivered(frame.seq_num):
-                print(f"🔄 Receiver: Already delivered frame {frame.seq_num}, sending ACK")
-                # Send ACK for already delivered frame
-                if self.send_ack(frame.seq_num):
-                    return [frame.seq_num]
-            else:
-                print(f"❌ Receiver: Frame {frame.seq_num} outside window [{self.base % self.max_seq_num}-{(self.base + self.window_size - 1) % self.max_seq_num}], discarded")
-                self.frames_discarded += 1
+            log.debug("📤 Receiver: ACK sent for frame %s", seq_num)
+            ack_nums = [seq_num]
         
+        # Only a frame at the window base can unblock in-order delivery
+        if offset == 0:
+            self.deliver_frames()
+        return ack_nums
+    
+    def _receive_outside_window(self, seq_num: int) -> Optional[Union[List[int], Tuple[int, int]]]:
+        """Slow path for frames that fall outside the receive window"""
+        if self.is_already_delivered(seq_num):
+            log.debug("🔄 Receiver: Already delivered frame %s, sending ACK", seq_num)
+            if self.sack_mode:
+                return self.send_sack()
+            # Send ACK for already delivered frame
+            if self.send_ack(seq_num):
+                return [seq_num]
+        else:
+            log.debug("❌ Receiver: Frame %s outside window [%s-%s], discarded", seq_num,
+                      self.base & self._seq_mask, (self.base + self.window_size - 1) & self._seq_mask)
+            self.frames_discarded += 1
         return None
     
     def is_in_window(self, seq_num: int) -> bool:
         """Check if sequence number is within receiver window"""
-        window_end = (self.base + self.window_size - 1) % self.max_seq_num
-        
-        if self.base % self.max_seq_num <= window_end:
-            return self.base % self.max_seq_num <= seq_num <= window_end
-        else:  # Window wraps around
-            return seq_num >= self.base % self.max_seq_num or seq_num <= window_end
+        return ((seq_num - self.base) & self._seq_mask) < self.window_size
     
     def is_already_delivered(self, seq_num: int) -> bool:
-        """Check if frame was already delivered"""
-        # Handle wrap-around case properly
-        if self.base > seq_num:
-            # Check if seq_num is in the "old" part of the sequence space
-            return seq_num < (self.base % self.max_seq_num)
-        else:
-            return seq_num < self.base
+        """Check if frame was already delivered (at most one window behind base)"""
+        behind = (self.base - seq_num) & self._seq_mask
+        return 0 < behind <= self.window_size and behind <= self.base
     
     def deliver_frames(self) -> List[int]:
         """Deliver frames in order and slide window"""
         delivered_acks = []
         
         # Deliver consecutive frames starting from base
-        while self.base % self.max_seq_num in self.buffer:
-            seq_num = self.base % self.max_seq_num
-            data = self.buffer[seq_num]
-            self.received_frames.append(data)
-            del self.buffer[seq_num]
+        slots = self.slots
+        present = self.present
+        mask = self._seq_mask
+        received = self.received_frames
+        count = self._received_count
+        base = self.base
+        idx = base & mask
+        while present[idx]:
+            data = slots[idx]
+            if count < len(received):
+                received[count] = data  # Fill the preallocated slot
+            else:
+                received.append(data)
+            count += 1
+            present[idx] = 0
+            slots[idx] = None
             
-            print(f"📤 Receiver: Delivered frame {seq_num} to upper layer - Data: '{data}'")
-            self.base += 1
+            log.debug("📤 Receiver: Delivered frame %s to upper layer - Data: '%s'", idx, data)
+            base += 1
+            idx = base & mask
+        
+        delivered = base - self.base
+        self._received_count = count
+        self._buffered -= delivered
+        self.sack_bits >>= delivered
+        self.base = base
         
         if delivered_acks:
-            print(f"🔄 Receiver: Window slid to base {self.base % self.max_seq_num}")
+            log.debug("🔄 Receiver: Window slid to base %s", self.base & self._seq_mask)
         
         return delivered_acks
     
     def send_ack(self, seq_num: int) -> bool:
         """Send acknowledgment for specific frame"""
         # Simulate ACK loss
-        if random.random() < 0.1:  # 10% ACK loss rate
-            print(f"📤 Receiver: ACK for frame {seq_num} sent but lost")
+        if self._draw() < 0.1:  # 10% ACK loss rate
+            log.debug("📤 Receiver: ACK for frame %s sent but lost", seq_num)
             return False
-        print(f"📤 Receiver: ACK sent for frame {seq_num}")
+        log.debug("📤 Receiver: ACK sent for frame %s", seq_num)
         return True
     
+    def send_sack(self) -> Optional[Tuple[int, int]]:
+        """Send one selective ACK covering the whole receive window"""
+        cum_ack = self.base & self._seq_mask  # Every frame before this was delivered
+        # Simulate ACK loss
+        if self._draw() < 0.1:  # 10% ACK loss rate
+            log.debug("📤 Receiver: SACK (next %s, bitmap %s) sent but lost", cum_ack, bin(self.sack_bits))
+            return None
+        log.debug("📤 Receiver: SACK sent (next %s, bitmap %s)", cum_ack, bin(self.sack_bits))
+        return cum_ack, self.sack_bits
+    
+    def iter_received(self) -> Iterator[str]:
+        """Iterate over the frames delivered so far without copying them"""
+        return islice(self.received_frames, self._received_count)
+    
     def get_received_data(self):
-        return self.received_frames
+        if len(self.received_frames) == self._received_count:
+            return self.received_frames
+        return self.received_frames[:self._received_count]
+    
+    @property
+    def received_count(self) -> int:
+        """Number of frames delivered in order so far"""
+        return self._received_count
     
     def get_statistics(self):
         return {
             "frames_received": self.total_frames_received,
             "frames_discarded": self.frames_discarded,
             "duplicate_frames": self.duplicate_frames,
-            "frames_delivered": len(self.received_frames),
-            "frames_buffered": len(self.buffer)
+            "frames_delivered": self._received_count,
+            "frames_buffered": self._buffered
         }
 
 def demonstrate_selective_repeat():
     """Demonstrate Selective Repeat ARQ protocol"""
+    # Show the per-frame protocol trace
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
+    log.setLevel(logging.DEBUG)
+    
     print("=" * 60)
     print("SELECTIVE REPEAT ARQ PROTOCOL SIMULATION")
     print("=" * 60)
     
     window_size = 4
-    sender = SelectiveRepeatSender(window_size=window_size, timeout=1.5)
+    sender = SelectiveRepeatSender(window_size=window_size, timeout=1.5, real_time=True)
     receiver = SelectiveRepeatReceiver(window_size=window_size)
     
     # Test data to send
@@ -380,8 +629,9 @@ def demonstrate_selective_repeat():
     print(f"📊 Duplicate frames received: {receiver_stats['duplicate_frames']}")
     print(f"📊 Total transmission attempts: {sender_stats['total_transmissions']}")
     print(f"📊 Retransmissions: {sender_stats['retransmissions']}")
-    print(f"📊 Protocol efficiency: {sender_stats['efficiency']}")
+    print(f"📊 Protocol efficiency: {sender_stats['efficiency_str']}")
     print(f"📊 Total simulation time: {end_time - start_time:.2f} seconds")
+    print(f"📊 Simulated channel time: {sender.virtual_clock:.2f} seconds")
     print(f"📊 Received data: {receiver.get_received_data()}")
     
     # Protocol characteristics
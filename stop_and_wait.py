@@ -8,139 +8,222 @@ In this protocol:
 - Simple but inefficient due to waiting time
 """
 
+import sys
 import time
 import random
-import threading
-from dataclasses import dataclass
+import logging
+from functools import lru_cache
 from typing import Optional
-from enum import Enum
+from enum import IntEnum
 
-class FrameType(Enum):
-    DATA = "DATA"
-    ACK = "ACK"
-    NAK = "NAK"
+log = logging.getLogger(__name__)
+
+MAX_RETRIES = 5  # Transmission attempts per frame before giving up
+
+class FrameType(IntEnum):
+    # Integer-valued so frame type checks are plain int comparisons;
+    # .name still gives "DATA"/"ACK"/"NAK"
+    DATA = 0
+    ACK = 1
+    NAK = 2
+
+@lru_cache(maxsize=4096)
+def _checksum(data: str) -> int:
+    """Sum of the payload's code points mod 256, memoized per payload"""
+    try:
+        return sum(data.encode('latin-1')) & 0xFF
+    except UnicodeEncodeError:  # Wider code points only contribute their low byte
+        return sum(data.encode('utf-32-le')[::4]) & 0xFF
 
-@dataclass
 class Frame:
-    seq_num: int
-    frame_type: FrameType
-    data: str = ""
-    checksum: int = 0
+    # Plain class so __slots__ can coexist with field defaults on Python < 3.10
+    __slots__ = ('seq_num', 'frame_type', 'data', 'checksum')
     
-    def __post_init__(self):
-        if self.frame_type == FrameType.DATA:
+    def __init__(self, seq_num: int, frame_type: FrameType, data: str = "", checksum: int = 0):
+        self.seq_num = seq_num
+        self.frame_type = frame_type
+        self.data = data
+        self.checksum = checksum
+        if frame_type == FrameType.DATA:
             self.checksum = self.calculate_checksum()
     
+    def __repr__(self):
+        return (f"Frame(seq_num={self.seq_num!r}, frame_type={self.frame_type!r}, "
+                f"data={self.data!r}, checksum={self.checksum!r})")
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.seq_num, self.frame_type, self.data, self.checksum) ==
+                (other.seq_num, other.frame_type, other.data, other.checksum))
+    
+    __hash__ = None  # Mutable, so unhashable
+    
+    @classmethod
+    def make_data(cls, seq_num: int, data: str) -> "Frame":
+        """Build a DATA frame without going through the constructor's type check"""
+        frame = cls.__new__(cls)
+        frame.seq_num = seq_num
+        frame.frame_type = FrameType.DATA
+        frame.data = data
+        frame.checksum = _checksum(data)
+        return frame
+    
     def calculate_checksum(self) -> int:
         """Simple checksum calculation"""
-        return sum(ord(c) for c in self.data) % 256
+        return _checksum(self.data)
     
-    def is_corrupted(self) -> bool:
+    def is_corrupted(self, rng=random) -> bool:
         """Simulate frame corruption during transmission"""
-        return random.random() < 0.1  # 10% corruption rate
+        return rng.random() < 0.1  # 10% corruption rate
 
 class StopAndWaitSender:
-    def __init__(self, timeout: float = 2.0):
+    def __init__(self, timeout: float = 2.0, real_time: bool = False, max_timeout: float = 2.0):
         self.timeout = timeout
+        self.max_timeout = max(max_timeout, timeout)  # Backoff ceiling
+        self.real_time = real_time  # Also sleep through simulated delays (demo pacing)
+        self.virtual_clock = 0.0  # Simulated seconds spent on the channel
         self.seq_num = 0
         self.waiting_for_ack = False
         self.current_frame: Optional[Frame] = None
         self.retransmission_count = 0
         self.total_transmissions = 0
+        self.successful_sends = 0  # Frames whose ACK came back
+        self._stats_key = None  # Counter values the cached statistics were built from
+        self._stats = None
         
-    def send_frame(self, data: str, receiver) -> bool:
-        """Send a frame using Stop-and-Wait protocol"""
-        frame = Frame(self.seq_num, FrameType.DATA, data)
+    def send_frame(self, data: str, receiver, abort=None) -> bool:
+        """Send a frame using Stop-and-Wait protocol
+
+        `abort` is an optional threading.Event; once it is set the
+        retransmission loop stops by raising TimeoutError.
+        """
+        frame = Frame.make_data(self.seq_num, data)
         self.current_frame = frame
         self.waiting_for_ack = True
         self.retransmission_count = 0
         
-        print(f"\n📤 Sender: Preparing to send frame {frame.seq_num} with data: '{data}'")
+        log.debug("📤 Sender: Preparing to send frame %s with data: '%s'", frame.seq_num, data)
         
-        while self.waiting_for_ack and self.retransmission_count < 5:  # Max 5 retransmissions
-            print(f"📡 Sender: Transmitting frame {frame.seq_num} (Attempt {self.retransmission_count + 1})")
+        while self.waiting_for_ack and self.retransmission_count < MAX_RETRIES:
+            if abort is not None and abort.is_set():
+                raise TimeoutError(f"Sending frame {frame.seq_num} aborted")
+            log.debug("📡 Sender: Transmitting frame %s (Attempt %s)", frame.seq_num, self.retransmission_count + 1)
             self.total_transmissions += 1
             
             # Simulate transmission delay
-            time.sleep(0.1)
+            self.advance_clock(0.1)
             
             # Send frame to receiver
             ack_received = receiver.receive_frame(frame)
             
             if ack_received:
-                print(f"✅ Sender: ACK received for frame {frame.seq_num}")
+                log.debug("✅ Sender: ACK received for frame %s", frame.seq_num)
                 self.waiting_for_ack = False
+                self.successful_sends += 1
                 self.seq_num = 1 - self.seq_num  # Toggle between 0 and 1
                 return True
             else:
-                print(f"⏰ Sender: Timeout! No ACK received for frame {frame.seq_num}")
+                log.debug("⏰ Sender: Timeout! No ACK received for frame %s", frame.seq_num)
                 self.retransmission_count += 1
-                time.sleep(self.timeout)  # Wait before retransmission
+                # Wait before retransmission, doubling the wait on each timeout
+                self.advance_clock(self.backoff_timeout(self.retransmission_count - 1))
         
-        print(f"❌ Sender: Failed to send frame {frame.seq_num} after {self.retransmission_count} attempts")
+        log.warning("❌ Sender: Failed to send frame %s after %s attempts", frame.seq_num, self.retransmission_count)
         return False
     
+    def backoff_timeout(self, attempts: int) -> float:
+        """Retransmission timeout after `attempts` consecutive timeouts (doubling, capped)"""
+        return min(self.timeout * (1 << min(attempts, 6)), self.max_timeout)
+    
+    def advance_clock(self, seconds: float):
+        """Move the simulated clock forward, sleeping too in real-time mode"""
+        self.virtual_clock += seconds
+        if self.real_time:
+            time.sleep(seconds)
+    
     def get_statistics(self):
-        return {
-            "total_transmissions": self.total_transmissions,
-            "efficiency": f"{(1/self.total_transmissions)*100:.1f}%" if self.total_transmissions > 0 else "0%"
-        }
+        # Rebuilt only when a counter has moved since the last call
+        key = (self.total_transmissions, self.successful_sends)
+        if key != self._stats_key:
+            self._stats_key = key
+            efficiency = (self.successful_sends / self.total_transmissions * 100) if self.total_transmissions > 0 else 0.0
+            self._stats = {
+                "total_transmissions": self.total_transmissions,
+                "successful_sends": self.successful_sends,
+                "efficiency": efficiency,
+                "efficiency_str": f"{efficiency:.1f}%"
+            }
+        return self._stats
 
 class StopAndWaitReceiver:
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng if rng is not None else random  # Loss/corruption draws (global stream by default)
+        self._draw = self.rng.random  # Bound once; called for every frame and ACK
         self.expected_seq_num = 0
         self.received_frames = []
+        self._received_count = 0
         
     def receive_frame(self, frame: Frame) -> bool:
         """Receive and process a frame"""
-        print(f"📥 Receiver: Received frame {frame.seq_num}")
+        log.debug("📥 Receiver: Received frame %s", frame.seq_num)
         
         # Simulate frame loss during transmission
-        if random.random() < 0.2:  # 20% frame loss rate
-            print(f"📦 Receiver: Frame {frame.seq_num} lost during transmission")
+        if self._draw() < 0.2:  # 20% frame loss rate
+            log.debug("📦 Receiver: Frame %s lost during transmission", frame.seq_num)
             return False
         
         # Check for corruption
-        if frame.is_corrupted():
-            print(f"💥 Receiver: Frame {frame.seq_num} is corrupted")
+        if frame.is_corrupted(self.rng):
+            log.debug("💥 Receiver: Frame %s is corrupted", frame.seq_num)
             self.send_nak(frame.seq_num)
             return False
         
         # Check sequence number
         if frame.seq_num == self.expected_seq_num:
-            print(f"✅ Receiver: Frame {frame.seq_num} accepted - Data: '{frame.data}'")
+            log.debug("✅ Receiver: Frame %s accepted - Data: '%s'", frame.seq_num, frame.data)
             self.received_frames.append(frame.data)
+            self._received_count += 1
             self.expected_seq_num = 1 - self.expected_seq_num  # Toggle between 0 and 1
             self.send_ack(frame.seq_num)
             return True
         else:
-            print(f"🔄 Receiver: Duplicate frame {frame.seq_num} discarded")
+            log.debug("🔄 Receiver: Duplicate frame %s discarded", frame.seq_num)
             self.send_ack(1 - self.expected_seq_num)  # Send ACK for previous frame
             return True  # Still send ACK to avoid infinite retransmission
     
     def send_ack(self, seq_num: int):
         """Send acknowledgment"""
         # Simulate ACK loss
-        if random.random() < 0.1:  # 10% ACK loss rate
-            print(f"📤 Receiver: ACK for frame {seq_num} sent but lost")
+        if self._draw() < 0.1:  # 10% ACK loss rate
+            log.debug("📤 Receiver: ACK for frame %s sent but lost", seq_num)
             return False
-        print(f"📤 Receiver: ACK sent for frame {seq_num}")
+        log.debug("📤 Receiver: ACK sent for frame %s", seq_num)
         return True
     
     def send_nak(self, seq_num: int):
         """Send negative acknowledgment"""
-        print(f"📤 Receiver: NAK sent for frame {seq_num}")
+        log.debug("📤 Receiver: NAK sent for frame %s", seq_num)
     
     def get_received_data(self):
         return self.received_frames
+    
+    @property
+    def received_count(self) -> int:
+        """Number of frames delivered in order so far"""
+        return self._received_count
 
 def demonstrate_stop_and_wait():
     """Demonstrate Stop-and-Wait ARQ protocol"""
+    # Show the per-frame protocol trace
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
+    log.setLevel(logging.DEBUG)
+    
     print("=" * 60)
     print("STOP-AND-WAIT ARQ PROTOCOL SIMULATION")
     print("=" * 60)
     
-    sender = StopAndWaitSender(timeout=1.0)
+    sender = StopAndWaitSender(timeout=1.0, real_time=True)
     receiver = StopAndWaitReceiver()
     
     # Test data to send
@@ -165,7 +248,7 @@ def demonstrate_stop_and_wait():
     print("=" * 60)
     print(f"📊 Frames sent successfully: {successful_transmissions}/{len(test_data)}")
     print(f"📊 Total transmission attempts: {sender.get_statistics()['total_transmissions']}")
-    print(f"📊 Protocol efficiency: {sender.get_statistics()['efficiency']}")
+    print(f"📊 Protocol efficiency: {sender.get_statistics()['efficiency_str']}")
     print(f"📊 Total simulation time: {end_time - start_time:.2f} seconds")
     print(f"📊 Received data: {receiver.get_received_data()}")
     
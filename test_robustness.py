@@ -5,126 +5,226 @@ This test specifically checks for potential infinite loops, stuck states,
 and other robustness issues across all three ARQ protocols.
 """
 
+import os
 import time
 import random
-import signal
 import sys
-from contextlib import contextmanager
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from functools import lru_cache
+from io import StringIO
+from typing import NamedTuple, Optional, Tuple
+
+# pytest is optional: the file also runs as a plain script
+try:
+    import pytest
+    PYTEST_AVAILABLE = True
+except ImportError:
+    PYTEST_AVAILABLE = False
+
+class TraceBuffer(logging.Handler):
+    """Keeps the most recent protocol log records; formatted only when a test fails"""
+    
+    def __init__(self, capacity: int = 1024):
+        super().__init__(logging.DEBUG)
+        self.records = deque(maxlen=capacity)
+    
+    def emit(self, record):
+        self.records.append(record)
+    
+    def format_log(self, last: int = 20) -> str:
+        """Render the newest `last` records, one indented line each"""
+        if not self.records:
+            return "      (no events recorded)"
+        start = max(0, len(self.records) - last)
+        return "\n".join(f"      {self.records[i].getMessage()}" for i in range(start, len(self.records)))
+
+@contextmanager
+def trace_protocol(module_name):
+    """Record a protocol module's full DEBUG trace into a TraceBuffer for the block"""
+    logger = logging.getLogger(module_name)
+    trace = TraceBuffer()
+    old_level = logger.level
+    logger.addHandler(trace)
+    logger.setLevel(logging.DEBUG)
+    try:
+        yield trace
+    finally:
+        logger.setLevel(old_level)
+        logger.removeHandler(trace)
 
 @contextmanager
 def timeout_context(seconds):
-    """Context manager to timeout operations"""
-    def timeout_handler(signum, frame):
-        raise TimeoutError(f"Operation timed out after {seconds} seconds")
-    
-    # Set the signal handler
-    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(seconds)
+    """Context manager yielding an Event that is set once `seconds` elapse
+
+    Protocol loops poll the event (their `abort` argument) and raise
+    TimeoutError when it fires, so no signal handler is needed.
+    """
+    expired = threading.Event()
+    timer = threading.Timer(seconds, expired.set)
+    timer.daemon = True
+    timer.start()
     
     try:
-        yield
+        yield expired
     finally:
-        # Restore the old handler
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, old_handler)
+        timer.cancel()
+
+# Per-scenario progress lines; set ARQ_VERBOSE=0 to print only failures
+VERBOSE = os.environ.get("ARQ_VERBOSE", "1") != "0"
+
+# Set ARQ_DEBUG=1 to run without deadlines, e.g. while stepping through a debugger
+_DEBUG = bool(os.environ.get("ARQ_DEBUG"))
 
-def test_protocol_robustness(protocol_name, sender_class, receiver_class, test_params):
-    """Test a protocol for robustness issues"""
-    print(f"\n🔍 Testing {protocol_name} robustness...")
+# Wall-clock allowance per scenario. The protocols wait on a virtual clock,
+# so a healthy run takes milliseconds; only a livelock can use this up
+WALL_CLOCK_BUDGET = 1.0
+
+# Payloads are shared, immutable constants; add_data copies them into its own buffer
+_HIGH_ERROR_DATA = ("Test1", "Test2", "Test3")
+_WINDOW_DATA = ("Data1", "Data2", "Data3", "Data4")
+_EXHAUST_DATA = ("A", "B", "C", "D", "E")  # More data than window
+_RAPID_SAW_DATA = ("RapidTest",)
+_RAPID_WINDOW_DATA = ("Rapid1", "Rapid2")
+
+class Scenario(NamedTuple):
+    number: int
+    name: str
+    seed: int
+    window_size: int
+    timeout: float  # Sender timeout
+    saw_data: Optional[Tuple[str, ...]]  # Stop-and-Wait payloads; None skips the protocol
+    windowed_data: Tuple[str, ...]  # Go-Back-N / Selective Repeat payloads
+    require_delivery: bool
+
+SCENARIOS = [
+    Scenario(1, "High error rate", 999, 3, 0.5, _HIGH_ERROR_DATA, _WINDOW_DATA, True),
+    Scenario(2, "Window exhaustion", 777, 2, 0.3, None, _EXHAUST_DATA, False),
+    Scenario(3, "Rapid retransmission", 555, 2, 0.1, _RAPID_SAW_DATA, _RAPID_WINDOW_DATA, False),  # Very short timeout
+]
+
+@lru_cache(maxsize=1)
+def _load_protocols():
+    """Import the protocols once: name -> (sender class, receiver class)"""
+    import stop_and_wait, go_back_n, selective_repeat
     
+    return {
+        "Stop-and-Wait": (stop_and_wait.StopAndWaitSender, stop_and_wait.StopAndWaitReceiver),
+        "Go-Back-N": (go_back_n.GoBackNSender, go_back_n.GoBackNReceiver),
+        "Selective Repeat": (selective_repeat.SelectiveRepeatSender, selective_repeat.SelectiveRepeatReceiver),
+    }
+
+PROTOCOL_NAMES = ("Stop-and-Wait", "Go-Back-N", "Selective Repeat")
+
+def scenario_data(protocol_name, scenario):
+    """Payloads a protocol sends in a scenario, or None if it does not apply"""
+    return scenario.saw_data if protocol_name == "Stop-and-Wait" else scenario.windowed_data
+
+def _run_saw(sender_class, receiver_class, test_data, window_size, timeout, rng, abort):
+    """Send the payloads one frame at a time; returns the number delivered"""
+    sender = sender_class(timeout=timeout)
+    receiver = receiver_class(rng=rng)
+    delivered = 0
+    for data in test_data:
+        if sender.send_frame(data, receiver, abort=abort):
+            delivered += 1
+    return delivered
+
+def _run_gbn(sender_class, receiver_class, test_data, window_size, timeout, rng, abort):
+    """Send the payloads through a Go-Back-N window; returns the number delivered"""
+    sender = sender_class(window_size=window_size, timeout=timeout)
+    receiver = receiver_class(rng=rng)
+    sender.add_data(test_data)
+    sender.send_frames(receiver, abort=abort)
+    return receiver.received_count
+
+def _run_sr(sender_class, receiver_class, test_data, window_size, timeout, rng, abort):
+    """Send the payloads through a Selective Repeat window; returns the number delivered"""
+    sender = sender_class(window_size=window_size, timeout=timeout)
+    receiver = receiver_class(window_size=window_size, rng=rng)
+    sender.add_data(test_data)
+    sender.send_frames(receiver, abort=abort)
+    return receiver.received_count
+
+# Protocol-specific setup, picked once per scenario instead of branching inline
+_RUNNERS = {
+    "Stop-and-Wait": _run_saw,
+    "Go-Back-N": _run_gbn,
+    "Selective Repeat": _run_sr,
+}
+
+def run_scenario(protocol_name, scenario, test_data):
+    """Run one robustness scenario against a protocol, returning the issues found"""
+    sender_class, receiver_class = _load_protocols()[protocol_name]
+    name, timeout, window_size = scenario.name, scenario.timeout, scenario.window_size
+    label = name.lower()
     issues_found = []
     
-    # Test 1: High error rate scenario
-    print(f"   📋 Test 1: High error rate scenario")
-    try:
-        with timeout_context(10):  # 10 second timeout
-            random.seed(999)  # Seed that might cause issues
-            
-            if protocol_name == "Stop-and-Wait":
-                sender = sender_class(timeout=0.5)
-                receiver = receiver_class()
-                
-                test_data = ["Test1", "Test2", "Test3"]
-                successful = 0
-                for data in test_data:
-                    if sender.send_frame(data, receiver):
-                        successful += 1
-                
-                if successful == 0:
-                    issues_found.append("No frames delivered in high error scenario")
-                    
-            else:  # Windowed protocols
-                sender = sender_class(window_size=3, timeout=0.5)
-                receiver = receiver_class() if protocol_name == "Go-Back-N" else receiver_class(window_size=3)
-                
-                test_data = ["Data1", "Data2", "Data3", "Data4"]
-                sender.add_data(test_data)
-                sender.send_frames(receiver)
-                
-                received = receiver.get_received_data()
-                if len(received) == 0:
-                    issues_found.append("No frames delivered in high error scenario")
-        
-        print(f"   ✅ High error rate test passed")
-    except TimeoutError:
-        issues_found.append("Timeout in high error rate scenario - possible infinite loop")
-        print(f"   ❌ High error rate test timed out")
-    except Exception as e:
-        issues_found.append(f"Exception in high error rate scenario: {str(e)}")
-        print(f"   ❌ High error rate test failed: {e}")
-    
-    # Test 2: Window exhaustion scenario (for windowed protocols)
-    if protocol_name != "Stop-and-Wait":
-        print(f"   📋 Test 2: Window exhaustion scenario")
+    if VERBOSE:
+        print(f"   📋 Test {scenario.number}: {name} scenario")
+    with trace_protocol(sender_class.__module__) as trace:
         try:
-            with timeout_context(8):  # 8 second timeout
-                random.seed(777)  # Different seed
-                
-                sender = sender_class(window_size=2, timeout=0.3)  # Small window
-                receiver = receiver_class() if protocol_name == "Go-Back-N" else receiver_class(window_size=2)
+            deadline = nullcontext() if _DEBUG else timeout_context(WALL_CLOCK_BUDGET)
+            with deadline as abort:  # abort is None when deadlines are disabled
+                rng = random.Random(scenario.seed)  # Private stream; safe in parallel workers
+                delivered = _RUNNERS[protocol_name](sender_class, receiver_class, test_data,
+                                                    window_size, timeout, rng, abort)
                 
-                test_data = ["A", "B", "C", "D", "E"]  # More data than window
-                sender.add_data(test_data)
-                sender.send_frames(receiver)
+                if scenario.require_delivery and delivered == 0:
+                    issues_found.append(f"No frames delivered in {label} scenario")
             
-            print(f"   ✅ Window exhaustion test passed")
+            if VERBOSE:
+                print(f"   ✅ {name} test passed")
         except TimeoutError:
-            issues_found.append("Timeout in window exhaustion scenario")
-            print(f"   ❌ Window exhaustion test timed out")
+            issues_found.append(f"Timeout in {label} scenario - possible infinite loop")
+            print(f"   ❌ {name} test timed out")
         except Exception as e:
-            issues_found.append(f"Exception in window exhaustion: {str(e)}")
-            print(f"   ❌ Window exhaustion test failed: {e}")
-    
-    # Test 3: Rapid retransmission scenario
-    print(f"   📋 Test 3: Rapid retransmission scenario")
-    try:
-        with timeout_context(6):  # 6 second timeout
-            random.seed(555)  # Seed for rapid retransmissions
-            
-            if protocol_name == "Stop-and-Wait":
-                sender = sender_class(timeout=0.1)  # Very short timeout
-                receiver = receiver_class()
-                
-                if sender.send_frame("RapidTest", receiver):
-                    pass  # Expected to eventually succeed or fail gracefully
-                    
-            else:  # Windowed protocols
-                sender = sender_class(window_size=2, timeout=0.1)  # Very short timeout
-                receiver = receiver_class() if protocol_name == "Go-Back-N" else receiver_class(window_size=2)
-                
-                sender.add_data(["Rapid1", "Rapid2"])
-                sender.send_frames(receiver)
+            issues_found.append(f"Exception in {label} scenario: {str(e)}")
+            print(f"   ❌ {name} test failed: {e}")
         
-        print(f"   ✅ Rapid retransmission test passed")
-    except TimeoutError:
-        issues_found.append("Timeout in rapid retransmission scenario")
-        print(f"   ❌ Rapid retransmission test timed out")
-    except Exception as e:
-        issues_found.append(f"Exception in rapid retransmission: {str(e)}")
-        print(f"   ❌ Rapid retransmission test failed: {e}")
+        # The protocol trace is only rendered when something went wrong
+        if issues_found:
+            print(f"   🔎 Last protocol events:\n{trace.format_log()}")
+    
+    return issues_found
+
+# (scenario, payloads) pairs per protocol family, resolved once at import;
+# Stop-and-Wait has no window to exhaust, so its plan simply omits that scenario
+_SAW_PLAN = tuple((scenario, scenario.saw_data) for scenario in SCENARIOS
+                  if scenario.saw_data is not None)
+_WINDOWED_PLAN = tuple((scenario, scenario.windowed_data) for scenario in SCENARIOS)
+_PLANS = {"Stop-and-Wait": _SAW_PLAN}
+
+def check_protocol_robustness(protocol_name):
+    """Run every applicable scenario against a protocol"""
+    if VERBOSE:
+        print(f"\n🔍 Testing {protocol_name} robustness...")
     
+    issues_found = []
+    for scenario, test_data in _PLANS.get(protocol_name, _WINDOWED_PLAN):
+        issues_found.extend(run_scenario(protocol_name, scenario, test_data))
     return issues_found
 
+if PYTEST_AVAILABLE:
+    @pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.name)
+    @pytest.mark.parametrize("protocol_name", PROTOCOL_NAMES)
+    def test_robustness(protocol_name, scenario):
+        """One (protocol, scenario) case, schedulable on its own by pytest-xdist"""
+        test_data = scenario_data(protocol_name, scenario)
+        if test_data is None:
+            pytest.skip(f"{scenario.name} does not apply to {protocol_name}")
+        assert run_scenario(protocol_name, scenario, test_data) == []
+
+def run_protocol_suite(protocol_name):
+    """Worker entry point: run one protocol's tests, returning (issues, report)"""
+    report = StringIO()
+    with redirect_stdout(report):
+        issues = check_protocol_robustness(protocol_name)
+    return issues, report.getvalue()
+
 def run_robustness_tests():
     """Run comprehensive robustness tests for all protocols"""
     print("=" * 70)
@@ -132,25 +232,21 @@ def run_robustness_tests():
     print("=" * 70)
     print("Testing for: infinite loops, timeouts, stuck states, excessive retransmissions")
     
-    # Import protocols
-    from stop_and_wait import StopAndWaitSender, StopAndWaitReceiver
-    from go_back_n import GoBackNSender, GoBackNReceiver
-    from selective_repeat import SelectiveRepeatSender, SelectiveRepeatReceiver
-    
-    protocols = [
-        ("Stop-and-Wait", StopAndWaitSender, StopAndWaitReceiver, {}),
-        ("Go-Back-N", GoBackNSender, GoBackNReceiver, {"window_size": 4}),
-        ("Selective Repeat", SelectiveRepeatSender, SelectiveRepeatReceiver, {"window_size": 4})
-    ]
+    protocols = PROTOCOL_NAMES
     
     all_issues = {}
     
-    for protocol_name, sender_class, receiver_class, params in protocols:
+    # The protocols share no state, so each suite runs in its own process;
+    # reports are buffered per worker and printed in the usual order
+    with ProcessPoolExecutor(max_workers=len(protocols)) as executor:
+        results = list(executor.map(run_protocol_suite, protocols))
+    
+    for protocol_name, (issues, report) in zip(protocols, results):
         print(f"\n{'=' * 50}")
         print(f"TESTING {protocol_name.upper()}")
         print(f"{'=' * 50}")
+        print(report, end="")
         
-        issues = test_protocol_robustness(protocol_name, sender_class, receiver_class, params)
         all_issues[protocol_name] = issues
         
         if not issues:
@@ -5,103 +5,171 @@ This test demonstrates the fixed Selective Repeat implementation with detailed e
 """
 
 import random
+import time
+import logging
+from itertools import zip_longest
 from selective_repeat import SelectiveRepeatSender, SelectiveRepeatReceiver
 
+_MISSING = object()  # Pads the shorter sequence so length differences show up as a mismatch
+
+def first_mismatch(expected, actual):
+    """Index of the first position where two sequences differ, or None if they match"""
+    for index, (want, got) in enumerate(zip_longest(expected, actual, fillvalue=_MISSING)):
+        if want != got:
+            return index
+    return None
+
+# Static report sections; each is written to stdout in a single call
+_KEY_FIXES = "\n".join([
+    "\n🔧 Key Fixes Applied:",
+    "   • Infinite loop prevention with max iterations",
+    "   • Window boundary checks for retransmissions",
+    "   • Maximum retransmission limit per frame",
+    "   • Proper cleanup of acknowledged frames",
+    "   • Improved timeout management",
+    "\n🚀 Starting transmission...",
+    "=" * 70,
+])
+
+_CHARACTERISTICS = "\n".join([
+    "\n📚 SELECTIVE REPEAT CHARACTERISTICS DEMONSTRATED",
+    "=" * 70,
+    "✅ Individual frame acknowledgments",
+    "✅ Selective retransmission of lost/corrupted frames only",
+    "✅ Out-of-order frame buffering at receiver",
+    "✅ Independent timers for each frame",
+    "✅ Window sliding based on acknowledged frames",
+    "✅ No unnecessary retransmissions of correctly received frames",
+])
+
 def test_selective_repeat_fixed():
     """Test the fixed Selective Repeat implementation"""
-    print("=" * 70)
-    print("SELECTIVE REPEAT ARQ - FOCUSED TEST & DEMONSTRATION")
-    print("=" * 70)
-    
     # Use a deterministic seed for reproducible results
-    random.seed(100)
+    rng = random.Random(100)
     
     sender = SelectiveRepeatSender(window_size=3, timeout=1.0)
-    receiver = SelectiveRepeatReceiver(window_size=3)
+    receiver = SelectiveRepeatReceiver(window_size=3, rng=rng)
     
     test_data = ["Data1", "Data2", "Data3", "Data4", "Data5"]
-    print(f"📋 Testing with {len(test_data)} frames: {test_data}")
-    print(f"📋 Window size: {sender.window_size}")
-    print(f"📋 Sequence number space: 0-{sender.max_seq_num-1}")
+    print("\n".join([
+        "=" * 70,
+        "SELECTIVE REPEAT ARQ - FOCUSED TEST & DEMONSTRATION",
+        "=" * 70,
+        f"📋 Testing with {len(test_data)} frames: {test_data}",
+        f"📋 Window size: {sender.window_size}",
+        f"📋 Sequence number space: 0-{sender.max_seq_num-1}",
+    ]))
     
     sender.add_data(test_data)
+    print(_KEY_FIXES)
     
-    print(f"\n🔧 Key Fixes Applied:")
-    print(f"   • Infinite loop prevention with max iterations")
-    print(f"   • Window boundary checks for retransmissions")
-    print(f"   • Maximum retransmission limit per frame")
-    print(f"   • Proper cleanup of acknowledged frames")
-    print(f"   • Improved timeout management")
-    
-    print(f"\n🚀 Starting transmission...")
-    print("=" * 70)
-    
-    import time
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     result = sender.send_frames(receiver)
-    end_time = time.time()
-    
-    print("=" * 70)
-    print("📊 RESULTS ANALYSIS")
-    print("=" * 70)
+    elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
     
     sender_stats = sender.get_statistics()
     receiver_stats = receiver.get_statistics()
     
-    print(f"✅ Transmission successful: {result}")
-    print(f"📤 Frames sent: {len(test_data)}")
-    print(f"📥 Frames delivered: {receiver_stats['frames_delivered']}")
-    print(f"📦 Frames buffered: {receiver_stats['frames_buffered']}")
-    print(f"🔄 Total transmissions: {sender_stats['total_transmissions']}")
-    print(f"🔄 Retransmissions: {sender_stats['retransmissions']}")
-    print(f"📈 Efficiency: {sender_stats['efficiency']}")
-    print(f"⏱️  Time taken: {end_time - start_time:.2f} seconds")
-    print(f"📋 Received data: {receiver.get_received_data()}")
-    
-    # Verify correctness
-    expected_data = test_data
-    actual_data = receiver.get_received_data()
-    
-    print(f"\n🧪 CORRECTNESS VERIFICATION")
-    print("=" * 70)
-    print(f"Expected: {expected_data}")
-    print(f"Actual:   {actual_data}")
-    print(f"✅ Data integrity: {'PASS' if expected_data == actual_data else 'FAIL'}")
-    print(f"✅ All frames delivered: {'PASS' if len(actual_data) == len(expected_data) else 'FAIL'}")
-    print(f"✅ Correct order: {'PASS' if actual_data == expected_data else 'FAIL'}")
+    print("\n".join([
+        "=" * 70,
+        "📊 RESULTS ANALYSIS",
+        "=" * 70,
+        f"✅ Transmission successful: {result}",
+        f"📤 Frames sent: {len(test_data)}",
+        f"📥 Frames delivered: {receiver_stats['frames_delivered']}",
+        f"📦 Frames buffered: {receiver_stats['frames_buffered']}",
+        f"🔄 Total transmissions: {sender_stats['total_transmissions']}",
+        f"🔄 Retransmissions: {sender_stats['retransmissions']}",
+        f"📈 Efficiency: {sender_stats['efficiency_str']}",
+        f"⏱️  Time taken: {elapsed_ms:.2f} ms",
+        f"📋 Received data: {receiver.get_received_data()}",
+    ]))
+    
+    # Verify correctness by streaming the delivered frames against the input
+    mismatch = first_mismatch(test_data, receiver.iter_received())
+    
+    lines = ["\n🧪 CORRECTNESS VERIFICATION", "=" * 70]
+    if mismatch is not None:
+        lines.append(f"First difference at frame {mismatch}")
+    lines += [
+        f"✅ Data integrity: {'PASS' if mismatch is None else 'FAIL'}",
+        f"✅ All frames delivered: {'PASS' if receiver.received_count == len(test_data) else 'FAIL'}",
+        f"✅ Correct order: {'PASS' if mismatch is None else 'FAIL'}",
+    ]
+    print("\n".join(lines))
     
     # Protocol characteristics summary
-    print(f"\n📚 SELECTIVE REPEAT CHARACTERISTICS DEMONSTRATED")
-    print("=" * 70)
-    print(f"✅ Individual frame acknowledgments")
-    print(f"✅ Selective retransmission of lost/corrupted frames only")
-    print(f"✅ Out-of-order frame buffering at receiver")
-    print(f"✅ Independent timers for each frame")
-    print(f"✅ Window sliding based on acknowledged frames")
-    print(f"✅ No unnecessary retransmissions of correctly received frames")
+    print(_CHARACTERISTICS)
     
-    return result and (actual_data == expected_data)
+    return result and mismatch is None
+
+def test_delivery_is_in_order_prefix():
+    """Whatever the channel does, the receiver must deliver an in-order prefix of the input"""
+    sr_log = logging.getLogger("selective_repeat")
+    old_level = sr_log.level
+    sr_log.setLevel(logging.ERROR)  # Give-up warnings are expected here
+    try:
+        data = [f"D{i}" for i in range(25)]
+        for seed in range(300):
+            for window_size in (2, 3, 4):
+                for sack_mode in (False, True):
+                    sender = SelectiveRepeatSender(window_size=window_size, timeout=1.0)
+                    receiver = SelectiveRepeatReceiver(window_size=window_size, rng=random.Random(seed),
+                                                       sack_mode=sack_mode)
+                    sender.add_data(data)
+                    completed = sender.send_frames(receiver)
+                    delivered = receiver.get_received_data()
+                    
+                    case = f"seed={seed} window={window_size} sack={sack_mode}"
+                    assert delivered == data[:len(delivered)], f"{case}: out of order {delivered}"
+                    assert not completed or delivered == data, f"{case}: reported success with {delivered}"
+    finally:
+        sr_log.setLevel(old_level)
+    
+    # Wider windows would let old and new frames share a sequence number
+    for window_size in (5, 8):
+        for cls in (SelectiveRepeatSender, SelectiveRepeatReceiver):
+            try:
+                cls(window_size=window_size)
+            except ValueError:
+                continue
+            raise AssertionError(f"{cls.__name__} accepted window_size={window_size}")
+
+_COMPARISON_ROWS = (
+    ("Stop-and-Wait", "1", "Single frame", "Low", "Simple"),
+    ("Go-Back-N", "N", "From error point", "Medium", "Medium"),
+    ("Selective Repeat", "N", "Selective only", "High", "Complex"),
+)
+
+# Static table, rendered once at import
+_COMPARISON_TABLE = "\n".join(
+    [f"{'Protocol':<18} {'Window':<8} {'Retransmission':<15} {'Efficiency':<12} {'Complexity'}", "-" * 70]
+    + [f"{name:<18} {window:<8} {retx:<15} {efficiency:<12} {complexity}"
+       for name, window, retx, efficiency, complexity in _COMPARISON_ROWS])
+
+_WHEN_TO_USE = "\n".join([
+    "\n💡 WHEN TO USE SELECTIVE REPEAT:",
+    "   • High-speed networks with low error rates",
+    "   • When bandwidth is expensive",
+    "   • Applications requiring maximum throughput",
+    "   • When complexity cost is acceptable",
+])
 
 def compare_with_other_protocols():
     """Brief comparison with other protocols"""
-    print(f"\n🆚 PROTOCOL COMPARISON SUMMARY")
-    print("=" * 70)
-    print(f"{'Protocol':<18} {'Window':<8} {'Retransmission':<15} {'Efficiency':<12} {'Complexity'}")
-    print("-" * 70)
-    print(f"{'Stop-and-Wait':<18} {'1':<8} {'Single frame':<15} {'Low':<12} {'Simple'}")
-    print(f"{'Go-Back-N':<18} {'N':<8} {'From error point':<15} {'Medium':<12} {'Medium'}")
-    print(f"{'Selective Repeat':<18} {'N':<8} {'Selective only':<15} {'High':<12} {'Complex'}")
-    
-    print(f"\n💡 WHEN TO USE SELECTIVE REPEAT:")
-    print(f"   • High-speed networks with low error rates")
-    print(f"   • When bandwidth is expensive")
-    print(f"   • Applications requiring maximum throughput")
-    print(f"   • When complexity cost is acceptable")
+    print("\n".join(["\n🆚 PROTOCOL COMPARISON SUMMARY", "=" * 70, _COMPARISON_TABLE, _WHEN_TO_USE]))
 
 if __name__ == "__main__":
     success = test_selective_repeat_fixed()
     compare_with_other_protocols()
     
+    try:
+        test_delivery_is_in_order_prefix()
+        print(f"\n✅ In-order delivery across 1800 seeded channels, oversized windows rejected: PASS")
+    except AssertionError as e:
+        print(f"\n❌ In-order delivery check failed: {e}")
+        success = False
+    
     if success:
         print(f"\n🎉 Selective Repeat ARQ test completed successfully!")
         print(f"The protocol now works correctly without infinite loops.")